@@ -0,0 +1,22 @@
+"""add devices (device_type, host) index
+
+Revision ID: 5b7e2d41c9a3
+Revises: 2cfc892a8ed4
+Create Date: 2026-10-16 09:12:04.118532
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2d41c9a3'
+down_revision = '2cfc892a8ed4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_devices_device_type_host', 'devices', ['device_type', 'host'], schema='minetrack')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_devices_device_type_host', table_name='devices', schema='minetrack')
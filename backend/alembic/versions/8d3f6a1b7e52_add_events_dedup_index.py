@@ -0,0 +1,27 @@
+"""add events dedup index
+
+Revision ID: 8d3f6a1b7e52
+Revises: 5b7e2d41c9a3
+Create Date: 2026-10-16 11:40:27.503814
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3f6a1b7e52'
+down_revision = '5b7e2d41c9a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_events_dedup',
+        'events',
+        ['device_id', 'employee_id', 'event_type', 'status', 'event_ts'],
+        schema='minetrack',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_dedup', table_name='events', schema='minetrack')
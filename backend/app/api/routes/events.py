@@ -3,10 +3,12 @@ from __future__ import annotations
 from datetime import datetime, timezone, timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy import and_, func, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.deps import get_db
@@ -16,7 +18,15 @@ from app.models.device import Device, DeviceType
 from app.models.employee import Employee
 from app.models.employee_external_id import EmployeeExternalID
 from app.models.event import Event, EventStatus, EventType
-from app.schemas.event import EventIngestRequest, EventOut, EventResult, EventPageOut
+from app.schemas.event import (
+    EVENT_ROW_COLUMNS,
+    EventIngestRequest,
+    EventOut,
+    EventPageOut,
+    EventResult,
+    encode_events,
+    encode_events_page,
+)
 
 router = APIRouter()
 
@@ -43,7 +53,7 @@ def _find_employee(db: Session, employee_no: str | None, external_system: str |
 def _has_recent_esmo_ok(db: Session, employee_id: int, event_ts: datetime) -> bool:
     window_start = event_ts - timedelta(hours=settings.ESMO_OK_WINDOW_HOURS)
     exists = (
-        db.query(Event)
+        db.query(Event.id)
         .filter(
             Event.employee_id == employee_id,
             Event.event_type == EventType.ESMO_OK,
@@ -78,15 +88,48 @@ def _apply_employee_search(query, search: str):
     return query.filter(and_(*predicates))
 
 
-@router.post("/ingest", response_model=list[EventResult])
+def _with_event_row_columns(query):
+    """Select flat EVENT_ROW_COLUMNS tuples (employee and device joined) instead of ORM events."""
+    return (
+        query.outerjoin(Employee, Employee.id == Event.employee_id)
+        .outerjoin(Device, Device.id == Event.device_id)
+        .with_entities(*EVENT_ROW_COLUMNS)
+    )
+
+
+async def _raw_body(request: Request) -> bytes:
+    return await request.body()
+
+
+@router.post(
+    "/ingest",
+    response_model=list[EventResult],
+    # The body is parsed by hand below; keep it documented as EventIngestRequest.
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": EventIngestRequest.model_json_schema()}},
+            "required": True,
+        }
+    },
+)
 def ingest_events(
-    payload: EventIngestRequest,
+    body: bytes = Depends(_raw_body),
     db: Session = Depends(get_db),
     api_key: str | None = Header(default=None, alias="X-API-Key"),
 ) -> list[EventResult]:
     if not api_key:
         raise HTTPException(status_code=401, detail="Missing API key")
 
+    # pydantic-core parses and validates the JSON in one pass, without building
+    # the intermediate dicts that FastAPI's own json.loads + validate would.
+    try:
+        payload = EventIngestRequest.model_validate_json(body)
+    except ValidationError as exc:
+        # Keep FastAPI's body error contract: locations start with "body".
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+        ) from exc
+
     # 1. Validate Device via API Key
     device_by_key = db.query(Device).filter(Device.api_key == api_key, Device.is_active.is_(True)).first()
     if not device_by_key:
@@ -313,7 +356,7 @@ def list_events(
     main_journal_only: bool = Query(default=False),
     status: EventStatus | None = Query(default=None),
     limit: int = Query(default=5000, ge=1, le=10000),
-) -> list[EventOut]:
+) -> Response:
     query = db.query(Event)
 
     if date_from:
@@ -346,11 +389,15 @@ def list_events(
     if search:
         query = _apply_employee_search(query, search)
     
-    # Eager load employee for display
-    # Eager load employee and device for display
-    query = query.options(joinedload(Event.employee), joinedload(Event.device))
-
-    return query.order_by(Event.event_ts.desc()).limit(limit).all()
+    rows = (
+        _with_event_row_columns(query)
+        .order_by(Event.event_ts.desc())
+        .limit(limit)
+        .all()
+    )
+    # Rows come straight from the DB: encode them directly, skipping model validation
+    # and serialization. response_model still documents the shape.
+    return Response(content=encode_events(rows), media_type="application/json")
 
 
 @router.get("/paged", response_model=EventPageOut)
@@ -368,7 +415,7 @@ def list_events_paged(
     status: EventStatus | None = Query(default=None),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=25, ge=1, le=500),
-) -> EventPageOut:
+) -> Response:
     query = db.query(Event)
 
     if date_from:
@@ -402,11 +449,11 @@ def list_events_paged(
         query = _apply_employee_search(query, search)
 
     total = query.count()
-    items = (
-        query.options(joinedload(Event.employee), joinedload(Event.device))
+    rows = (
+        _with_event_row_columns(query)
         .order_by(Event.event_ts.desc())
         .offset(offset)
         .limit(limit)
         .all()
     )
-    return EventPageOut(items=items, total=total)
+    return Response(content=encode_events_page(rows, total), media_type="application/json")
@@ -18,6 +18,8 @@ from typing import Any
 import re
 
 from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from sqlalchemy import cast, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
 from app.core.config import settings
@@ -275,16 +277,16 @@ def _collect_mine_turnstile_users(mine_devices: list[dict]) -> tuple[list[dict[s
     unreachable: list[str] = []
     for device_conf in mine_devices:
         host = str(device_conf.get("host", "")).strip()
-        client = HikvisionClient(
+        with HikvisionClient(
             host=host,
             user=settings.HIKVISION_USER,
             password=settings.HIKVISION_PASS,
-        )
-        if not client.check_connection():
-            unreachable.append(host)
-            continue
+        ) as client:
+            if not client.check_connection():
+                unreachable.append(host)
+                continue
 
-        users = client.fetch_all_users()
+            users = client.fetch_all_users()
         for user_data in users:
             scanned_users += 1
             raw_external = str(user_data.get("employeeNo", "")).strip()
@@ -606,15 +608,6 @@ def hikvision_webhook(request: Request, body: bytes = Body(...)) -> Response:
             logger.info("Ignored webhook event from disabled device: %s", device.device_code)
             return Response(status_code=200, content="OK")
 
-        # Check duplicate
-        existing = (
-            db.query(Event)
-            .filter(Event.device_id == device.id, Event.raw_id == raw_id)
-            .first()
-        )
-        if existing:
-            return Response(status_code=200, content="OK")
-
         server_now = datetime.now(timezone(timedelta(hours=5)))
         event_ts = _select_event_ts(ip_address, event_data, server_now)
         
@@ -626,8 +619,8 @@ def hikvision_webhook(request: Request, body: bytes = Body(...)) -> Response:
 
         # Secondary dedup: same person can be emitted twice with different IDs/serials.
         if normalized_payload_name:
-            nearby = (
-                db.query(Event)
+            nearby_names = (
+                db.query(Event.source_payload["name"].astext)
                 .filter(
                     Event.device_id == device.id,
                     Event.event_type == event_type,
@@ -636,10 +629,7 @@ def hikvision_webhook(request: Request, body: bytes = Body(...)) -> Response:
                 )
                 .all()
             )
-            if any(
-                _normalize_name((evt.source_payload or {}).get("name", "")) == normalized_payload_name
-                for evt in nearby
-            ):
+            if any(_normalize_name(name) == normalized_payload_name for (name,) in nearby_names):
                 return Response(status_code=200, content="OK")
 
         # Find employee
@@ -650,43 +640,55 @@ def hikvision_webhook(request: Request, body: bytes = Body(...)) -> Response:
             # Still save the event with a log, but skip if no employee
             return Response(status_code=200, content="OK")
 
-        # Debounce: ignore repeated reads from the same device in a short window.
-        recent_event = (
-            db.query(Event)
-            .filter(
+        # Debounce (repeated reads from the same device in a short window) and the
+        # raw_id duplicate check run inside the INSERT itself: one round-trip.
+        events_table = Event.__table__
+        recent_read = (
+            select(Event.id)
+            .where(
                 Event.device_id == device.id,
                 Event.employee_id == employee.id,
                 Event.event_type == event_type,
                 Event.event_ts >= event_ts - timedelta(seconds=DEDUP_SECONDS),
                 Event.event_ts <= event_ts + timedelta(seconds=1),
             )
-            .first()
+            .exists()
         )
-
-        if recent_event:
-            logger.info("Debounced duplicate event for employee %s (type=%s)", employee_no, event_type)
-            print(f"DEBUG: Debounced duplicate event for {employee_no}")
-            return Response(status_code=200, content="OK")
-
-        event = Event(
-            device_id=device.id,
-            employee_id=employee.id,
-            event_type=event_type,
-            event_ts=event_ts,
-            raw_id=raw_id,
-            status=EventStatus.ACCEPTED,
-            source_payload={
+        values = {
+            "device_id": device.id,
+            "employee_id": employee.id,
+            "event_type": event_type,
+            "event_ts": event_ts,
+            "received_ts": datetime.now(timezone.utc),
+            "raw_id": raw_id,
+            "status": EventStatus.ACCEPTED,
+            "source_payload": {
                 **event_data,
                 "source_host": ip_address,
                 "source_request_ip": request_ip,
             },
+        }
+        # Explicit casts: untyped parameters in a SELECT list would resolve to text, not the enums.
+        new_row = select(
+            *(cast(value, events_table.c[column].type) for column, value in values.items())
+        ).where(~recent_read)
+        stmt = (
+            pg_insert(events_table)
+            .from_select(list(values), new_row)
+            .on_conflict_do_nothing(index_elements=["device_id", "raw_id"])
+            .returning(events_table.c.id)
         )
-        db.add(event)
+        event_id = db.execute(stmt).scalar()
         db.commit()
+
+        if event_id is None:
+            logger.info("Skipped duplicate/debounced event for employee %s (type=%s)", employee_no, event_type)
+            return Response(status_code=200, content="OK")
+
         logger.info(
             "Saved event: employee=%s, type=%s, device=%s, ts=%s",
             employee_no,
-            event.event_type.value,
+            event_type.value,
             ip_address,
             event_ts,
         )
@@ -728,14 +730,15 @@ def hikvision_status(_: Any = Depends(get_current_user)) -> dict:
             last_event = None
             if db_device:
                 event_count = db.query(Event).filter(Event.device_id == db_device.id).count()
-                latest = (
-                    db.query(Event)
+                latest_ts = (
+                    db.query(Event.event_ts)
                     .filter(Event.device_id == db_device.id)
                     .order_by(Event.event_ts.desc())
-                    .first()
+                    .limit(1)
+                    .scalar()
                 )
-                if latest:
-                    last_event = latest.event_ts.isoformat()
+                if latest_ts:
+                    last_event = latest_ts.isoformat()
 
             device_statuses.append({
                 "name": name,
@@ -1281,16 +1284,15 @@ def start_user_sync(
     
     from app.core.hikvision_client import HikvisionClient
     
-    client = HikvisionClient(
+    with HikvisionClient(
         host=host,
         user=settings.HIKVISION_USER,
         password=settings.HIKVISION_PASS
-    )
-
-    if not client.check_connection():
-         return {"success": False, "message": f"Could not connect to turnstile {host}"}
+    ) as client:
+        if not client.check_connection():
+            return {"success": False, "message": f"Could not connect to turnstile {host}"}
 
-    users = client.fetch_all_users()
+        users = client.fetch_all_users()
     logger.info("Sync found %d users on device", len(users))
 
     db = SessionLocal()
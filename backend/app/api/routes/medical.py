@@ -88,19 +88,22 @@ def _fetch_esmo_employees_from_portal(max_pages: int) -> tuple[list[dict], str |
 
 
 def _split_full_name(full_name: str) -> tuple[str, str, str | None]:
-    parts = [p for p in full_name.split() if p]
+    # str.split() never yields empty parts; the tail is re-split to normalise its spacing.
+    parts = full_name.split(None, 2)
     if not parts:
         return "Unknown", "", None
-    last_name = parts[0]
-    first_name = parts[1] if len(parts) > 1 else ""
-    patronymic = " ".join(parts[2:]) if len(parts) > 2 else None
-    return last_name, first_name, patronymic
+    if len(parts) == 1:
+        return parts[0], "", None
+    if len(parts) == 2:
+        return parts[0], parts[1], None
+    return parts[0], parts[1], " ".join(parts[2].split())
 
 
 def _find_employee_for_esmo(db: Session, pass_id: str, full_name: str) -> Employee | None:
     if pass_id:
         ext = (
             db.query(EmployeeExternalID)
+            .options(joinedload(EmployeeExternalID.employee))
             .filter(
                 EmployeeExternalID.system == ESMO_SYSTEM,
                 EmployeeExternalID.external_id == pass_id,
@@ -108,7 +111,7 @@ def _find_employee_for_esmo(db: Session, pass_id: str, full_name: str) -> Employ
             .first()
         )
         if ext:
-            return db.query(Employee).filter(Employee.id == ext.employee_id).first()
+            return ext.employee
 
         by_no = db.query(Employee).filter(Employee.employee_no == pass_id).first()
         if by_no:
@@ -56,6 +56,12 @@ TURNSTILE_OUT_HOSTS = {
 
 MINE_TURNSTILE_HOSTS = {"192.168.1.180", "192.168.1.181"}
 
+# "last first patronymic", built by PostgreSQL; concat_ws skips a NULL patronymic and
+# trim matches the old Python f-string + strip() for empty parts.
+EMPLOYEE_FULL_NAME = func.trim(
+    func.concat_ws(" ", Employee.last_name, Employee.first_name, Employee.patronymic)
+).label("full_name")
+
 LAMP_TURNSTILE_EVENT_TYPES = (
     EventType.TURNSTILE_IN,
     EventType.TURNSTILE_OUT,
@@ -417,7 +423,7 @@ def inside_mine(
     cutoff = datetime.now(TZ) - timedelta(hours=24)
     
     rows = (
-        db.query(Employee, subq.c.last_in, subq.c.last_out)
+        db.query(Employee.id, Employee.employee_no, EMPLOYEE_FULL_NAME, subq.c.last_in)
         .join(subq, subq.c.employee_id == Employee.id)
         .filter(subq.c.last_in.isnot(None))
         .filter(subq.c.last_in >= cutoff)
@@ -426,12 +432,11 @@ def inside_mine(
     )
 
     result: list[InsideMineItem] = []
-    for emp, last_in, _last_out in rows:
-        full_name = f"{emp.last_name} {emp.first_name} {emp.patronymic or ''}".strip()
+    for employee_id, employee_no, full_name, last_in in rows:
         result.append(
             InsideMineItem(
-                employee_id=emp.id,
-                employee_no=emp.employee_no,
+                employee_id=employee_id,
+                employee_no=employee_no,
                 full_name=full_name,
                 last_in=last_in,
             )
@@ -457,7 +462,7 @@ def tool_debts(
     )
 
     rows_query = (
-        db.query(Employee, subq.c.last_take, subq.c.last_return)
+        db.query(Employee.id, Employee.employee_no, EMPLOYEE_FULL_NAME, subq.c.last_take)
         .join(subq, subq.c.employee_id == Employee.id)
         .filter(subq.c.last_take.isnot(None))
         .filter((subq.c.last_return.is_(None)) | (subq.c.last_take > subq.c.last_return))
@@ -470,12 +475,11 @@ def tool_debts(
     rows = rows_query.all()
 
     result: list[ToolDebtItem] = []
-    for emp, last_take, _last_return in rows:
-        full_name = f"{emp.last_name} {emp.first_name} {emp.patronymic or ''}".strip()
+    for employee_id, employee_no, full_name, last_take in rows:
         result.append(
             ToolDebtItem(
-                employee_id=emp.id,
-                employee_no=emp.employee_no,
+                employee_id=employee_id,
+                employee_no=employee_no,
                 full_name=full_name,
                 last_take=last_take,
             )
@@ -909,7 +913,11 @@ def daily_mine_summary(
     if not summary:
         return []
 
-    employees = db.query(Employee).filter(Employee.id.in_(list(summary.keys()))).all()
+    employees = (
+        db.query(Employee.id, Employee.employee_no, EMPLOYEE_FULL_NAME)
+        .filter(Employee.id.in_(list(summary.keys())))
+        .all()
+    )
     by_id = {emp.id: emp for emp in employees}
 
     result: list[MineWorkSummaryItem] = []
@@ -936,12 +944,11 @@ def daily_mine_summary(
                 if l_out > l_in:
                     session_minutes = int((l_out - l_in).total_seconds() // 60)
 
-        full_name = f"{emp.last_name} {emp.first_name} {emp.patronymic or ''}".strip()
         result.append(
             MineWorkSummaryItem(
                 employee_id=emp.id,
                 employee_no=(data.get("display_employee_no") or emp.employee_no),
-                full_name=full_name,
+                full_name=emp.full_name,
                 total_minutes=max(session_minutes, 0),
                 last_in=last_in,
                 last_out=final_last_out,
@@ -40,9 +40,14 @@ class Settings(BaseSettings):
     HIKVISION_USER: str = "admin"
     HIKVISION_PASS: str = ""
     HIKVISION_POLL_INTERVAL: int = 30
+    HIKVISION_POLL_INTERVAL_MIN: int = 5
+    HIKVISION_POLL_INTERVAL_MAX: int = 60
     HIKVISION_DEVICES: str = "[]"
     HIKVISION_INITIAL_LOOKBACK_HOURS: int = 24
     HIKVISION_RECOVERY_OVERLAP_SECONDS: int = 120
+    HIKVISION_MAX_CONCURRENCY: int = 4
+    # Keep the whole ISAPI event dict in Event.source_payload instead of the report fields.
+    HIKVISION_STORE_FULL_PAYLOAD: bool = False
 
     BACKEND_CORS_ORIGINS: List[str] = ["http://127.0.0.1:5173", "http://localhost:5173"]
 
@@ -2,11 +2,14 @@
 
 import logging
 import re
+from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 import urllib3
 
 # Suppress HTTPS warnings for local IP certificates.
@@ -14,6 +17,121 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger("esmo")
 
+# Plausibility bounds shared by every vitals parser path.
+_PULSE_MIN, _PULSE_MAX = 30, 220
+_TEMPERATURE_MIN, _TEMPERATURE_MAX = 30.0, 45.0
+_ALCOHOL_MAX_MG_L = 10.0
+
+# Vitals parsing runs for every exam row; keep the patterns compiled once at import.
+_RE_PRESSURE_LABEL = re.compile(r"(давлен|pressure|bosim)", re.IGNORECASE)
+_RE_PULSE_LABEL = re.compile(r"(пульс|pulse|puls)", re.IGNORECASE)
+_RE_TEMP_LABEL = re.compile(r"(температур|temperature|temp|harorat)", re.IGNORECASE)
+_RE_ALC_LABEL = re.compile(r"(алкогол|alcohol)", re.IGNORECASE)
+_RE_PRESSURE_PAIR = re.compile(r"\b(\d{2,3})\s*/\s*(\d{2,3})\b")
+_RE_INT2_3 = re.compile(r"\b(\d{2,3})\b")
+_RE_INT_ONLY = re.compile(r"\D*(\d{2,3})\D*")
+_COMMA_TO_DOT = str.maketrans({",": "."})
+_RE_TEMP_VAL = re.compile(r"\b(\d{2}(?:\.\d)?)\b")
+_RE_TEMP_DOT = re.compile(r"\b(\d{2}\.\d)\b")
+_RE_NUM = re.compile(r"\b(\d+(?:\.\d+)?)\b")
+
+# Labelled vitals in flattened row/detail text, matched in a single scan and
+# dispatched on the outer group name.
+_RE_VITALS_TEXT = re.compile(
+    r"(?P<pressure>(?:Р°СЂС‚РµСЂРёР°Р»[Р°-СЏ]*\s+РґР°РІР»РµРЅ[Р°-СЏ]*|blood pressure|РґР°РІР»РµРЅ[Р°-СЏ]*|bp)"
+    r"[^\d]{0,20}(?P<systolic>\d{2,3})\s*/\s*(?P<diastolic>\d{2,3}))"
+    r"|(?P<pulse>(?:РїСѓР»СЊСЃ|pulse)[^\d]{0,20}(?P<pulse_value>\d{2,3})\b)"
+    r"|(?P<temperature>(?:С‚РµРјРїРµСЂР°С‚СѓСЂ[Р°-СЏ]*|temperature|temp)[^\d]{0,20}(?P<temperature_value>\d{2}(?:[.,]\d)?)\b)",
+    re.IGNORECASE,
+)
+
+_MANUAL_REVIEW_MARKERS = (
+    "\u0440\u0443\u0447\u043d\u0430\u044f \u043f\u0440\u043e\u0432\u0435\u0440\u043a\u0430",
+    "manual check",
+    "manual review",
+)
+
+# Result markers are matched against lowered row text; one alternation scan per side
+# instead of a substring search per marker.
+_POSITIVE_RESULT_MARKERS = (
+    "\u043e\u0441\u043c\u043e\u0442\u0440 \u043e\u043a\u043e\u043d\u0447\u0435\u043d, \u043f\u043e\u043b\u043e\u0436",
+    "\u043e\u0441\u043c\u043e\u0442\u0440 \u043e\u043a\u043e\u043d\u0447\u0435\u043d \u043f\u043e\u043b\u043e\u0436",
+    "\u0434\u043e\u043f\u0443\u0441\u043a \u0440\u0430\u0437\u0440\u0435\u0448\u0435\u043d",
+    "\u0434\u043e\u043f\u0443\u0441\u043a \u0440\u0430\u0437\u0440\u0435\u0448\u0451\u043d",
+)
+_NEGATIVE_RESULT_MARKERS = (
+    "\u043d\u0435\u0434\u043e\u043f\u0443\u0441\u043a",
+    "\u0434\u043e\u043f\u0443\u0441\u043a \u0437\u0430\u043f\u0440\u0435\u0449",
+    "\u043d\u0435 \u0434\u043e\u043f\u0443\u0449",
+    "\u043e\u0441\u043c\u043e\u0442\u0440 \u043d\u0435 \u043f\u0440\u043e\u0439\u0434\u0435\u043d",
+    "\u043f\u043e\u0432\u044b\u0448\u0435\u043d\u043d\u043e\u0435",
+    "\u043f\u043e\u043d\u0438\u0436\u0435\u043d\u043d\u043e\u0435",
+    "\u043e\u0442\u043a\u0430\u0437",
+    "\u043e\u0442\u043a\u043b\u043e\u043d",
+)
+_ANNUL_MARKERS = (
+    "аннулировать мо",
+    "мо аннулирован",
+    "мо аннулирована",
+    "мо аннулировано",
+    "аннулирован мо",
+    "аннулирована мо",
+    "аннулировано мо",
+    "отменен мо",
+    "отмена мо",
+)
+_RE_POSITIVE_MARKERS = re.compile("|".join(map(re.escape, _POSITIVE_RESULT_MARKERS)))
+_RE_NEGATIVE_MARKERS = re.compile("|".join(map(re.escape, _NEGATIVE_RESULT_MARKERS)))
+_RE_ANNUL_MARKERS = re.compile("|".join(map(re.escape, _ANNUL_MARKERS)))
+
+# Follow-up journal and monitor pages are only read for their exam rows; building the
+# tree for just those rows skips the page chrome entirely.
+_EXAM_ROWS_ONLY = SoupStrainer("tr", class_="item")
+
+# Pupilometry (pp) fallback page only needs two headings; XPath avoids a full soup build.
+_PP_TITLE_XPATH = etree.XPath("(//*[@id='page_title']//h1)[1]")
+_PP_CENTER_H2_XPATH = etree.XPath("(//h2[contains(concat(' ', normalize-space(@class), ' '), ' center ')])[1]")
+
+
+def _lxml_text(node) -> str:
+    """Match BeautifulSoup get_text(" ", strip=True) for an lxml element."""
+    return " ".join(part.strip() for part in node.itertext() if part.strip())
+
+
+@dataclass(slots=True)
+class Vitals:
+    """Vitals parsed from one exam row or MO card."""
+
+    pressure_systolic: Optional[int] = None
+    pressure_diastolic: Optional[int] = None
+    pulse: Optional[int] = None
+    temperature: Optional[float] = None
+    alcohol_mg_l: Optional[float] = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pressure_systolic": self.pressure_systolic,
+            "pressure_diastolic": self.pressure_diastolic,
+            "pulse": self.pulse,
+            "temperature": self.temperature,
+            "alcohol_mg_l": self.alcohol_mg_l,
+        }
+
+
+def _extract_bounded_int(s: str, lo: int, hi: int) -> Optional[int]:
+    """Return the only 2-3 digit number in ``s`` when it lies within [lo, hi]."""
+    # Bare numeric cells are the common case and skip the regex engine entirely.
+    if s.isdecimal():
+        if not 2 <= len(s) <= 3:
+            return None
+        value = int(s)
+    else:
+        m = _RE_INT_ONLY.fullmatch(s)
+        if m is None:
+            return None
+        value = int(m.group(1))
+    return value if lo <= value <= hi else None
+
 
 class EsmoClient:
     """
@@ -66,6 +184,10 @@ class EsmoClient:
     def close(self) -> None:
         self.session.close()
 
+    def clear_detail_cache(self) -> None:
+        """Drop cached MO detail pages so long-lived clients see fresh results."""
+        self._exam_detail_cache.clear()
+
     def _auth_headers(self) -> dict[str, str]:
         referer = f"{self.base_url}personal/"
         headers: dict[str, str] = {"Referer": referer}
@@ -229,14 +351,18 @@ class EsmoClient:
                 pages_to_fetch = total_pages
             pages_to_fetch = max(pages_to_fetch, 1)
 
-            for page_no in range(1, pages_to_fetch + 1):
-                if page_no == 1:
+            # Build follow-up page URLs up front; page 1 is already parsed above.
+            page_urls = [
+                f"{self.base_url}pp/journal/page_{page_no}.html"
+                for page_no in range(2, pages_to_fetch + 1)
+            ]
+            for page_url in [None, *page_urls]:
+                if page_url is None:
                     page_rows = first_page_rows
                 else:
-                    page_url = f"{self.base_url}pp/journal/page_{page_no}.html"
                     try:
                         resp = self._get(page_url)
-                        page_soup = BeautifulSoup(resp.text, "lxml")
+                        page_soup = BeautifulSoup(resp.text, "lxml", parse_only=_EXAM_ROWS_ONLY)
                         page_rows = self._parse_exam_rows(page_soup)
                     except Exception as exc:
                         logger.warning("ESMO journal page fetch failed for %s: %s", page_url, exc)
@@ -266,7 +392,7 @@ class EsmoClient:
             for monitor_url in (f"{self.base_url}monitor/",):
                 try:
                     monitor_resp = self._get(monitor_url)
-                    monitor_soup = BeautifulSoup(monitor_resp.text, "lxml")
+                    monitor_soup = BeautifulSoup(monitor_resp.text, "lxml", parse_only=_EXAM_ROWS_ONLY)
                     monitor_rows = self._parse_exam_rows(monitor_soup)
                     if monitor_rows:
                         break
@@ -274,28 +400,27 @@ class EsmoClient:
                     logger.debug("ESMO monitor enrichment failed for %s: %s", monitor_url, exc)
 
             if monitor_rows:
-                merged_by_id: dict[int, dict[str, Any]] = {
-                    int(item["esmo_id"]): item
-                    for item in exams
-                    if isinstance(item.get("esmo_id"), int)
-                }
+                # Overlay monitor fields onto journal rows in place; journal order is already
+                # descending by esmo_id, so only monitor-only rows require re-sorting.
+                exams_by_id: dict[int, dict[str, Any]] = {item["esmo_id"]: item for item in exams}
+                monitor_only: list[dict[str, Any]] = []
                 for m in monitor_rows:
                     mid = m.get("esmo_id")
                     if not isinstance(mid, int):
                         continue
-                    if stop_at_known and mid <= since_esmo_id and mid not in merged_by_id:
+                    current = exams_by_id.get(mid)
+                    if current is not None:
+                        # monitor row has authoritative current status/comment-driven result
+                        current.update(m)
+                        continue
+                    if stop_at_known and mid <= since_esmo_id:
                         continue
-                    current = merged_by_id.get(mid)
-                    if current is None:
-                        merged_by_id[mid] = m
-                    else:
-                        merged_by_id[mid] = {
-                            **current,
-                            # monitor row has authoritative current status/comment-driven result
-                            **m,
-                        }
-
-                exams = sorted(merged_by_id.values(), key=lambda x: int(x.get("esmo_id") or 0), reverse=True)
+                    exams_by_id[mid] = m
+                    monitor_only.append(m)
+
+                if monitor_only:
+                    exams.extend(monitor_only)
+                    exams.sort(key=itemgetter("esmo_id"), reverse=True)
 
             if exams:
                 self.last_error = None
@@ -317,7 +442,7 @@ class EsmoClient:
         for url in fallback_candidates:
             try:
                 resp = self._get(url)
-                soup = BeautifulSoup(resp.text, "lxml")
+                soup = BeautifulSoup(resp.text, "lxml", parse_only=_EXAM_ROWS_ONLY)
                 rows = self._parse_exam_rows(soup)
                 if not rows:
                     continue
@@ -366,8 +491,11 @@ class EsmoClient:
             total_pages = self._extract_total_pages(soup)
             pages_to_fetch = total_pages if self.employee_max_pages is None else min(total_pages, self.employee_max_pages)
 
-            for page_no in range(2, pages_to_fetch + 1):
-                page_url = f"{self.base_url}personal/page_{page_no}.html"
+            page_urls = [
+                f"{self.base_url}personal/page_{page_no}.html"
+                for page_no in range(2, pages_to_fetch + 1)
+            ]
+            for page_url in page_urls:
                 try:
                     page_resp = self._get(page_url)
                     page_soup = BeautifulSoup(page_resp.text, "lxml")
@@ -507,11 +635,11 @@ class EsmoClient:
             emp_info_cell = cells[4]
         if emp_info_cell is None:
             return None
+        emp_text = emp_info_cell.get_text(" ", strip=True)
         emp_link = emp_info_cell.find("a")
-        employee_name = emp_link.get_text(strip=True) if emp_link else emp_info_cell.get_text(" ", strip=True)
+        employee_name = emp_link.get_text(strip=True) if emp_link else emp_text
         # "Propusk: 2034" can be mojibake depending on portal output;
         # use the last numeric token from employee info.
-        emp_text = emp_info_cell.get_text(" ", strip=True)
         pass_nums = re.findall(r"\b\d{3,10}\b", emp_text)
         employee_pass_id = pass_nums[-1] if pass_nums else None
         check_cell = row.select_one("td.result")
@@ -554,17 +682,17 @@ class EsmoClient:
                 timestamp = timestamp or str(detail.get("timestamp") or "")
                 if result is None:
                     result = detail.get("result")
-                if vitals.get("pressure_systolic") is None:
-                    vitals["pressure_systolic"] = detail.get("pressure_systolic")
-                if vitals.get("pressure_diastolic") is None:
-                    vitals["pressure_diastolic"] = detail.get("pressure_diastolic")
-                if vitals.get("pulse") is None:
-                    vitals["pulse"] = detail.get("pulse")
-                if vitals.get("temperature") is None:
-                    vitals["temperature"] = detail.get("temperature")
-                if vitals.get("alcohol_mg_l") in (None, 0, 0.0):
+                if vitals.pressure_systolic is None:
+                    vitals.pressure_systolic = detail.get("pressure_systolic")
+                if vitals.pressure_diastolic is None:
+                    vitals.pressure_diastolic = detail.get("pressure_diastolic")
+                if vitals.pulse is None:
+                    vitals.pulse = detail.get("pulse")
+                if vitals.temperature is None:
+                    vitals.temperature = detail.get("temperature")
+                if vitals.alcohol_mg_l in (None, 0, 0.0):
                     if detail.get("alcohol_mg_l") is not None:
-                        vitals["alcohol_mg_l"] = detail.get("alcohol_mg_l")
+                        vitals.alcohol_mg_l = detail.get("alcohol_mg_l")
 
         return {
             "esmo_id": esmo_id,
@@ -573,7 +701,7 @@ class EsmoClient:
             "employee_name": employee_name,
             "employee_pass_id": employee_pass_id,
             "result": result,
-            **vitals,
+            **vitals.as_dict(),
         }
 
     def _fetch_exam_detail(self, esmo_id: int) -> Dict[str, Any]:
@@ -636,11 +764,10 @@ class EsmoClient:
             detail["result"] = result
 
             # Prefer structured table parsing for vitals: this is stable even when text labels vary.
-            table_vitals = self._extract_vitals_from_detail_table(mo_soup)
-            detail.update(table_vitals)
+            vitals = self._parse_vitals_from_detail_table(mo_soup)
 
             # Fill vitals from full-page text.
-            detail.update(self._enrich_vitals_from_text(detail, mo_text))
+            detail.update(self._enrich_vitals_from_text(vitals, mo_text).as_dict())
         except Exception as exc:
             logger.warning("ESMO detail fetch failed for mo_id=%s: %s", esmo_id, exc)
 
@@ -649,17 +776,17 @@ class EsmoClient:
             try:
                 pp_url = f"{self.origin}/window/mo/{esmo_id}/pp/"
                 pp_resp = self._get(pp_url)
-                pp_soup = BeautifulSoup(pp_resp.text, "lxml")
-                heading = pp_soup.select_one("#page_title h1")
+                pp_tree = lxml_html.fromstring(pp_resp.text)
+                heading = _PP_TITLE_XPATH(pp_tree)
                 if heading:
-                    h_text = heading.get_text(" ", strip=True)
+                    h_text = _lxml_text(heading[0])
                     m_name = re.search(r"сотрудника\s+(.+)$", h_text, flags=re.IGNORECASE)
                     if m_name:
                         detail["employee_name"] = m_name.group(1).strip()
 
-                center_h2 = pp_soup.select_one("h2.center")
+                center_h2 = _PP_CENTER_H2_XPATH(pp_tree)
                 if center_h2:
-                    h2_text = center_h2.get_text(" ", strip=True)
+                    h2_text = _lxml_text(center_h2[0])
                     ts_matches = re.findall(r"\b\d{2}\.\d{2}\.\d{4}\s+\d{2}:\d{2}\b", h2_text)
                     if ts_matches and not detail.get("timestamp"):
                         detail["timestamp"] = ts_matches[-1]
@@ -674,13 +801,10 @@ class EsmoClient:
         return detail
 
     def _extract_vitals_from_detail_table(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        vitals: Dict[str, Any] = {
-            "pressure_systolic": None,
-            "pressure_diastolic": None,
-            "pulse": None,
-            "temperature": None,
-            "alcohol_mg_l": 0.0,
-        }
+        return self._parse_vitals_from_detail_table(soup).as_dict()
+
+    def _parse_vitals_from_detail_table(self, soup: BeautifulSoup) -> Vitals:
+        vitals = Vitals()
 
         # Typical structure: table.info -> rows with 3 cells (label, value, range).
         values: list[str] = []
@@ -690,7 +814,8 @@ class EsmoClient:
             if len(tds) < 2:
                 continue
             raw_label = tds[0].get_text(" ", strip=True).lower()
-            raw_value = tds[1].get_text(" ", strip=True)
+            # Decimal commas are normalized once so the numeric patterns only need ".".
+            raw_value = tds[1].get_text(" ", strip=True).translate(_COMMA_TO_DOT)
             labeled_rows.append((raw_label, raw_value))
             if raw_value:
                 values.append(raw_value)
@@ -700,180 +825,169 @@ class EsmoClient:
 
         # Prefer label-based extraction when possible (stable even if numbers overlap).
         for label, value in labeled_rows:
-            if vitals["pressure_systolic"] is not None and vitals["pressure_diastolic"] is not None:
+            if vitals.pressure_systolic is not None and vitals.pressure_diastolic is not None:
                 break
-            if not re.search(r"(давлен|pressure|bosim)", label, flags=re.IGNORECASE):
+            if not _RE_PRESSURE_LABEL.search(label):
                 continue
-            pair = re.search(r"\b(\d{2,3})\s*/\s*(\d{2,3})\b", value)
+            pair = _RE_PRESSURE_PAIR.search(value)
             if pair:
-                vitals["pressure_systolic"] = int(pair.group(1))
-                vitals["pressure_diastolic"] = int(pair.group(2))
+                vitals.pressure_systolic = int(pair.group(1))
+                vitals.pressure_diastolic = int(pair.group(2))
 
         for label, value in labeled_rows:
-            if vitals["pulse"] is not None:
+            if vitals.pulse is not None:
                 break
-            if not re.search(r"(пульс|pulse|puls)", label, flags=re.IGNORECASE):
+            if not _RE_PULSE_LABEL.search(label):
                 continue
-            m = re.search(r"\b(\d{2,3})\b", value)
+            m = _RE_INT2_3.search(value)
             if not m:
                 continue
             pulse_val = int(m.group(1))
-            if 30 <= pulse_val <= 220:
-                vitals["pulse"] = pulse_val
+            if _PULSE_MIN <= pulse_val <= _PULSE_MAX:
+                vitals.pulse = pulse_val
 
         for label, value in labeled_rows:
-            if vitals["temperature"] is not None:
+            if vitals.temperature is not None:
                 break
-            if not re.search(r"(температур|temperature|temp|harorat)", label, flags=re.IGNORECASE):
+            if not _RE_TEMP_LABEL.search(label):
                 continue
-            m = re.search(r"\b(\d{2}(?:[.,]\d)?)\b", value)
+            m = _RE_TEMP_VAL.search(value)
             if not m:
                 continue
-            temp_val = float(m.group(1).replace(",", "."))
-            if 30.0 <= temp_val <= 45.0:
-                vitals["temperature"] = temp_val
+            temp_val = float(m.group(1))
+            if _TEMPERATURE_MIN <= temp_val <= _TEMPERATURE_MAX:
+                vitals.temperature = temp_val
 
         for label, value in labeled_rows:
-            if vitals["alcohol_mg_l"] not in (None, 0.0):
+            if vitals.alcohol_mg_l not in (None, 0.0):
                 break
-            if not re.search(r"(алкогол|alcohol)", label, flags=re.IGNORECASE):
+            if not _RE_ALC_LABEL.search(label):
                 continue
-            m = re.search(r"\b(\d+(?:[.,]\d+)?)\b", value)
+            m = _RE_NUM.search(value)
             if not m:
                 continue
-            alcohol_val = float(m.group(1).replace(",", "."))
-            if 0.0 < alcohol_val < 10.0:
-                vitals["alcohol_mg_l"] = alcohol_val
+            alcohol_val = float(m.group(1))
+            if 0.0 < alcohol_val < _ALCOHOL_MAX_MG_L:
+                vitals.alcohol_mg_l = alcohol_val
 
         # Fallback numeric extraction if labels are missing/broken.
-        # Pressure can appear as a pair in one cell or as two separate rows.
+        # One pass over the values collects every candidate; they are resolved below.
+        pair = None
+        ints: list[int] = []
+        temp_fallback = None
+        alcohol_fallback = None
         for v in values:
-            pair = re.search(r"\b(\d{2,3})\s*/\s*(\d{2,3})\b", v)
-            if pair:
-                vitals["pressure_systolic"] = int(pair.group(1))
-                vitals["pressure_diastolic"] = int(pair.group(2))
-                break
-
-        if vitals["pressure_systolic"] is None or vitals["pressure_diastolic"] is None:
-            ints = []
-            for v in values:
-                m = re.fullmatch(r"\D*(\d{2,3})\D*", v)
+            if pair is None:
+                pair = _RE_PRESSURE_PAIR.search(v)
+            n = _extract_bounded_int(v, 0, 999)
+            if n is not None:
+                ints.append(n)
+            if temp_fallback is None:
+                m = _RE_TEMP_VAL.search(v)
+                if m:
+                    temp = float(m.group(1))
+                    if _TEMPERATURE_MIN <= temp <= _TEMPERATURE_MAX:
+                        temp_fallback = temp
+            if alcohol_fallback is None:
+                m = _RE_NUM.search(v)
                 if m:
-                    ints.append(int(m.group(1)))
-            if len(ints) >= 2:
-                vitals["pressure_systolic"] = ints[0]
-                vitals["pressure_diastolic"] = ints[1]
+                    val = float(m.group(1))
+                    if 0.0 < val < _ALCOHOL_MAX_MG_L:
+                        alcohol_fallback = val
+
+        # Pressure can appear as a pair in one cell or as two separate rows.
+        if pair:
+            vitals.pressure_systolic = int(pair.group(1))
+            vitals.pressure_diastolic = int(pair.group(2))
+        if (vitals.pressure_systolic is None or vitals.pressure_diastolic is None) and len(ints) >= 2:
+            vitals.pressure_systolic = ints[0]
+            vitals.pressure_diastolic = ints[1]
 
         # Pulse: first plausible integer after pressure values.
-        for v in values:
-            m = re.fullmatch(r"\D*(\d{2,3})\D*", v)
-            if not m:
-                continue
-            n = int(m.group(1))
-            if vitals["pressure_systolic"] is not None and n == vitals["pressure_systolic"]:
-                continue
-            if vitals["pressure_diastolic"] is not None and n == vitals["pressure_diastolic"]:
+        skip = frozenset(x for x in (vitals.pressure_systolic, vitals.pressure_diastolic) if x is not None)
+        for n in ints:
+            if n in skip:
                 continue
-            if 30 <= n <= 220:
-                vitals["pulse"] = n
+            if _PULSE_MIN <= n <= _PULSE_MAX:
+                vitals.pulse = n
                 break
 
         # Temperature: first decimal-like value in human range.
-        for v in values:
-            m = re.search(r"\b(\d{2}(?:[.,]\d)?)\b", v)
-            if not m:
-                continue
-            temp = float(m.group(1).replace(",", "."))
-            if 30.0 <= temp <= 45.0:
-                vitals["temperature"] = temp
-                break
+        if temp_fallback is not None:
+            vitals.temperature = temp_fallback
 
         # Alcohol (if non-zero provided).
-        for v in values:
-            m = re.search(r"\b(\d+(?:[.,]\d+)?)\b", v)
-            if not m:
-                continue
-            val = float(m.group(1).replace(",", "."))
-            if 0.0 < val < 10.0:
-                vitals["alcohol_mg_l"] = val
-                break
+        if alcohol_fallback is not None:
+            vitals.alcohol_mg_l = alcohol_fallback
 
         return vitals
 
-    def _parse_vitals_from_cell(self, check_cell) -> Dict[str, Any]:
-        vitals = {
-            "pressure_systolic": None,
-            "pressure_diastolic": None,
-            "pulse": None,
-            "temperature": None,
-            "alcohol_mg_l": 0.0,
-        }
+    def _parse_vitals_from_cell(self, check_cell) -> Vitals:
+        vitals = Vitals()
 
         if check_cell is None:
             return vitals
 
         # Preferred path: parse nested table row values by position.
-        nested_rows = check_cell.find_all("tr")
-        values: list[str] = []
-        for row in nested_rows:
-            tds = row.find_all("td")
-            if len(tds) >= 2:
-                values.append(tds[1].get_text(" ", strip=True))
+        values = [td.get_text(" ", strip=True) for td in check_cell.select("tr > td:nth-of-type(2)")]
 
         for val in values:
-            pressure_match = re.search(r"\b(\d{2,3})\s*/\s*(\d{2,3})\b", val)
-            if pressure_match:
-                vitals["pressure_systolic"] = int(pressure_match.group(1))
-                vitals["pressure_diastolic"] = int(pressure_match.group(2))
+            if vitals.pressure_systolic is None:
+                pressure_match = _RE_PRESSURE_PAIR.search(val)
+                if pressure_match:
+                    vitals.pressure_systolic = int(pressure_match.group(1))
+                    vitals.pressure_diastolic = int(pressure_match.group(2))
+            if vitals.pulse is None:
+                pulse_val = val.strip()
+                if pulse_val.isdigit():
+                    p = int(pulse_val)
+                    if _PULSE_MIN <= p <= _PULSE_MAX:
+                        vitals.pulse = p
+            if vitals.temperature is None:
+                temp_match = _RE_TEMP_DOT.search(val)
+                if temp_match:
+                    vitals.temperature = float(temp_match.group(1))
+            if (
+                vitals.pressure_systolic is not None
+                and vitals.pulse is not None
+                and vitals.temperature is not None
+            ):
                 break
 
-        for val in values:
-            pulse_val = val.strip()
-            if pulse_val.isdigit():
-                p = int(pulse_val)
-                if 30 <= p <= 220:
-                    vitals["pulse"] = p
-                    break
+        # Fallback path: parse from flattened text, built only once a field is missing.
+        text: Optional[str] = None
 
-        for val in values:
-            temp_match = re.search(r"\b(\d{2}\.\d)\b", val)
-            if temp_match:
-                vitals["temperature"] = float(temp_match.group(1))
-                break
-
-        # Fallback path: parse from flattened text.
-        if vitals["pressure_systolic"] is None or vitals["pulse"] is None or vitals["temperature"] is None:
+        if vitals.pressure_systolic is None:
             text = check_cell.get_text(" ", strip=True)
+            pressure_match = _RE_PRESSURE_PAIR.search(text)
+            if pressure_match:
+                vitals.pressure_systolic = int(pressure_match.group(1))
+                vitals.pressure_diastolic = int(pressure_match.group(2))
 
-            if vitals["pressure_systolic"] is None:
-                pressure_match = re.search(r"\b(\d{2,3})\s*/\s*(\d{2,3})\b", text)
-                if pressure_match:
-                    vitals["pressure_systolic"] = int(pressure_match.group(1))
-                    vitals["pressure_diastolic"] = int(pressure_match.group(2))
-
-            if vitals["temperature"] is None:
-                temp_match = re.search(r"\b(\d{2}\.\d)\b", text)
-                if temp_match:
-                    vitals["temperature"] = float(temp_match.group(1))
-
-            if vitals["pulse"] is None:
-                nums = [int(n) for n in re.findall(r"\b\d{2,3}\b", text)]
-                if nums:
-                    # Ignore pressure numbers if present and pick the first plausible pulse.
-                    for n in nums:
-                        if 30 <= n <= 220:
-                            vitals["pulse"] = n
-                            break
+        if vitals.temperature is None:
+            if text is None:
+                text = check_cell.get_text(" ", strip=True)
+            temp_match = _RE_TEMP_DOT.search(text)
+            if temp_match:
+                vitals.temperature = float(temp_match.group(1))
+
+        if vitals.pulse is None:
+            if text is None:
+                text = check_cell.get_text(" ", strip=True)
+            # Stop at the first plausible pulse instead of collecting every number.
+            for m in _RE_INT2_3.finditer(text):
+                n = int(m.group(1))
+                if _PULSE_MIN <= n <= _PULSE_MAX:
+                    vitals.pulse = n
+                    break
 
         return vitals
 
     def _detect_manual_review(self, row_text: str, decision_text: str) -> bool:
-        text = f"{row_text} {decision_text}".lower()
-        return (
-            "\u0440\u0443\u0447\u043d\u0430\u044f \u043f\u0440\u043e\u0432\u0435\u0440\u043a\u0430" in text
-            or "manual check" in text
-            or "manual review" in text
-        )
+        return self._detect_manual_review_lower(f"{row_text} {decision_text}".lower())
+
+    def _detect_manual_review_lower(self, text_lower: str) -> bool:
+        return any(marker in text_lower for marker in _MANUAL_REVIEW_MARKERS)
 
     def _detect_exam_result(
         self,
@@ -892,42 +1006,15 @@ class EsmoClient:
         annul_blob = " ".join(
             part for part in [comment_text, admittance_text, admittance_classes] if part
         ).lower()
-        annul_markers = (
-            "аннулировать мо",
-            "мо аннулирован",
-            "мо аннулирована",
-            "мо аннулировано",
-            "аннулирован мо",
-            "аннулирована мо",
-            "аннулировано мо",
-            "отменен мо",
-            "отмена мо",
-        )
-        if any(marker in annul_blob for marker in annul_markers):
+        if _RE_ANNUL_MARKERS.search(annul_blob):
             # Annulled exam is not a successful pass; keep distinct marker for UI.
             return "annulled"
-        if self._detect_manual_review(blob, ""):
+        if self._detect_manual_review_lower(blob):
             return "review"
         has_pass_class = "dopusk_1" in admittance_classes or "dopusk_state_1" in admittance_classes
         has_fail_class = "dopusk_0" in admittance_classes or "dopusk_state_0" in admittance_classes
-        positive_markers = (
-            "\u043e\u0441\u043c\u043e\u0442\u0440 \u043e\u043a\u043e\u043d\u0447\u0435\u043d, \u043f\u043e\u043b\u043e\u0436",
-            "\u043e\u0441\u043c\u043e\u0442\u0440 \u043e\u043a\u043e\u043d\u0447\u0435\u043d \u043f\u043e\u043b\u043e\u0436",
-            "\u0434\u043e\u043f\u0443\u0441\u043a \u0440\u0430\u0437\u0440\u0435\u0448\u0435\u043d",
-            "\u0434\u043e\u043f\u0443\u0441\u043a \u0440\u0430\u0437\u0440\u0435\u0448\u0451\u043d",
-        )
-        negative_markers = (
-            "\u043d\u0435\u0434\u043e\u043f\u0443\u0441\u043a",
-            "\u0434\u043e\u043f\u0443\u0441\u043a \u0437\u0430\u043f\u0440\u0435\u0449",
-            "\u043d\u0435 \u0434\u043e\u043f\u0443\u0449",
-            "\u043e\u0441\u043c\u043e\u0442\u0440 \u043d\u0435 \u043f\u0440\u043e\u0439\u0434\u0435\u043d",
-            "\u043f\u043e\u0432\u044b\u0448\u0435\u043d\u043d\u043e\u0435",
-            "\u043f\u043e\u043d\u0438\u0436\u0435\u043d\u043d\u043e\u0435",
-            "\u043e\u0442\u043a\u0430\u0437",
-            "\u043e\u0442\u043a\u043b\u043e\u043d",
-        )
-        has_positive_text = any(m in blob for m in positive_markers)
-        has_negative_text = any(m in blob for m in negative_markers)
+        has_positive_text = _RE_POSITIVE_MARKERS.search(blob) is not None
+        has_negative_text = _RE_NEGATIVE_MARKERS.search(blob) is not None
         if has_positive_text and not has_negative_text:
             return "passed"
         if has_negative_text and not has_positive_text:
@@ -940,37 +1027,40 @@ class EsmoClient:
         # already-correct "passed" values from previous poll iterations.
         return None
 
-    def _enrich_vitals_from_text(self, vitals: Dict[str, Any], text: str) -> Dict[str, Any]:
+    def _enrich_vitals_from_text(self, vitals: Vitals, text: str) -> Vitals:
         if not text:
             return vitals
 
-        # Pressure
-        if vitals["pressure_systolic"] is None or vitals["pressure_diastolic"] is None:
-            pressure_match = re.search(
-                r"(?:Р°СЂС‚РµСЂРёР°Р»[Р°-СЏ]*\s+РґР°РІР»РµРЅ[Р°-СЏ]*|blood pressure|РґР°РІР»РµРЅ[Р°-СЏ]*|bp)[^\d]{0,20}(\d{2,3})\s*/\s*(\d{2,3})",
-                text,
-                flags=re.IGNORECASE,
-            )
-            if pressure_match:
-                vitals["pressure_systolic"] = int(pressure_match.group(1))
-                vitals["pressure_diastolic"] = int(pressure_match.group(2))
-            else:
-                generic_pressure = re.search(r"\b(\d{2,3})\s*/\s*(\d{2,3})\b", text)
-                if generic_pressure:
-                    vitals["pressure_systolic"] = int(generic_pressure.group(1))
-                    vitals["pressure_diastolic"] = int(generic_pressure.group(2))
-
-        # Pulse
-        if vitals["pulse"] is None:
-            pulse_match = re.search(r"(?:РїСѓР»СЊСЃ|pulse)[^\d]{0,20}(\d{2,3})\b", text, flags=re.IGNORECASE)
-            if pulse_match:
-                vitals["pulse"] = int(pulse_match.group(1))
-
-        # Temperature
-        if vitals["temperature"] is None:
-            temp_match = re.search(r"(?:С‚РµРјРїРµСЂР°С‚СѓСЂ[Р°-СЏ]*|temperature|temp)[^\d]{0,20}(\d{2}(?:[.,]\d)?)\b", text, flags=re.IGNORECASE)
-            if temp_match:
-                vitals["temperature"] = float(temp_match.group(1).replace(",", "."))
+        need_pressure = vitals.pressure_systolic is None or vitals.pressure_diastolic is None
+        need_pulse = vitals.pulse is None
+        need_temperature = vitals.temperature is None
+        if not (need_pressure or need_pulse or need_temperature):
+            # Structured parsing already filled everything; skip scanning the text blob.
+            return vitals
+
+        for m in _RE_VITALS_TEXT.finditer(text):
+            kind = m.lastgroup
+            if kind == "pressure":
+                if need_pressure:
+                    vitals.pressure_systolic = int(m.group("systolic"))
+                    vitals.pressure_diastolic = int(m.group("diastolic"))
+                    need_pressure = False
+            elif kind == "pulse":
+                if need_pulse:
+                    vitals.pulse = int(m.group("pulse_value"))
+                    need_pulse = False
+            elif need_temperature:
+                vitals.temperature = float(m.group("temperature_value").replace(",", "."))
+                need_temperature = False
+            if not (need_pressure or need_pulse or need_temperature):
+                break
+
+        # Unlabelled "120/80" pair as the last resort for pressure.
+        if need_pressure:
+            generic_pressure = _RE_PRESSURE_PAIR.search(text)
+            if generic_pressure:
+                vitals.pressure_systolic = int(generic_pressure.group(1))
+                vitals.pressure_diastolic = int(generic_pressure.group(2))
 
         return vitals
 
@@ -16,10 +16,14 @@ from app.models.medical_exam import MedicalExam
 
 logger = logging.getLogger("esmo.monitoring")
 
-_ALLOWED_SLOT_IDS = {"7", "8", "9", "10"}
+_ALLOWED_SLOT_IDS = frozenset({"7", "8", "9", "10"})
+_RE_TKM_TERMINAL = re.compile(r"\bTKM\s*[1-4]\s*-\s*terminal\b", re.IGNORECASE)
+_RE_TERMINAL_SLOT = re.compile(r"\bterminal\s*\[(\d{1,3})\]", re.IGNORECASE)
 
 
 _lock = threading.Lock()
+_health_client_lock = threading.Lock()
+_health_client: EsmoClient | None = None
 
 _poller_metrics: dict[str, Any] = {
     "last_run_at": None,
@@ -103,8 +107,7 @@ def get_poller_metrics() -> dict[str, Any]:
 
 
 def _query_db_latest_ids(n: int) -> list[int]:
-    db = SessionLocal()
-    try:
+    with SessionLocal() as db:
         rows = (
             db.query(MedicalExam.esmo_id)
             .filter(MedicalExam.esmo_id.isnot(None))
@@ -113,26 +116,37 @@ def _query_db_latest_ids(n: int) -> list[int]:
             .all()
         )
         return [int(row[0]) for row in rows if row[0] is not None]
-    finally:
-        db.close()
 
 
 
+def _get_health_client() -> EsmoClient:
+    global _health_client
+    if _health_client is None:
+        _health_client = EsmoClient(
+            base_url=settings.ESMO_BASE_URL,
+            username=settings.ESMO_USER,
+            password=settings.ESMO_PASS,
+            timeout=settings.ESMO_REQUEST_TIMEOUT,
+            login_retries=settings.ESMO_LOGIN_RETRIES,
+        )
+    return _health_client
+
+
 def _query_portal_latest_ids(n: int, max_pages: int) -> list[int]:
-    client = EsmoClient(
-        base_url=settings.ESMO_BASE_URL,
-        username=settings.ESMO_USER,
-        password=settings.ESMO_PASS,
-        timeout=settings.ESMO_REQUEST_TIMEOUT,
-        login_retries=settings.ESMO_LOGIN_RETRIES,
-    )
-    try:
+    # Reuse one logged-in portal session across checks; the lock also serializes
+    # on-demand checks from the health route with the background loop.
+    with _health_client_lock:
+        client = _get_health_client()
+        client.clear_detail_cache()
         rows = client.fetch_exams_since(since_esmo_id=None, max_pages=max(max_pages, 1))
-        rows = [row for row in rows if _is_allowed_terminal(row.get("terminal"))]
-        ids = sorted({int(r["esmo_id"]) for r in rows if isinstance(r.get("esmo_id"), int)}, reverse=True)
-        return ids[: max(n, 1)]
-    finally:
-        client.close()
+        if not rows and client.is_logged_in:
+            # Expired portal sessions render the login form instead of journal rows.
+            client.is_logged_in = False
+            rows = client.fetch_exams_since(since_esmo_id=None, max_pages=max(max_pages, 1))
+
+    rows = [row for row in rows if _is_allowed_terminal(row.get("terminal"))]
+    ids = sorted({int(r["esmo_id"]) for r in rows if isinstance(r.get("esmo_id"), int)}, reverse=True)
+    return ids[: max(n, 1)]
 
 
 def _is_allowed_terminal(raw_terminal: Any) -> bool:
@@ -140,17 +154,15 @@ def _is_allowed_terminal(raw_terminal: Any) -> bool:
     if not text:
         return False
 
-    if re.search(r"\bTKM\s*[1-4]\s*-\s*terminal\b", text, flags=re.IGNORECASE):
+    if _RE_TKM_TERMINAL.search(text):
         return True
 
-    slot_match = re.search(r"\bterminal\s*\[(\d{1,3})\]", text, flags=re.IGNORECASE)
+    slot_match = _RE_TERMINAL_SLOT.search(text)
     if slot_match and slot_match.group(1) in _ALLOWED_SLOT_IDS:
         return True
 
-    if re.fullmatch(r"\d{1,3}", text) and text in _ALLOWED_SLOT_IDS:
-        return True
-
-    return False
+    # Compact rows carry the bare slot number; every allowed id is already 1-3 digits.
+    return text in _ALLOWED_SLOT_IDS
 
 
 
@@ -245,7 +257,7 @@ async def esmo_healthcheck_loop() -> None:
 
     while True:
         try:
-            await asyncio.get_event_loop().run_in_executor(None, run_esmo_health_check)
+            await asyncio.to_thread(run_esmo_health_check)
         except Exception as exc:
             logger.error("ESMO HealthCheck loop exception: %s", exc)
 
@@ -6,12 +6,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
-from sqlalchemy import func
+from sqlalchemy import Integer, and_, exists, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -27,6 +33,39 @@ from app.models.medical_exam import MedicalExam
 
 logger = logging.getLogger("esmo.poller")
 
+# Results the parser reports with confidence; anything else keeps the stored result.
+_VALID_EXAM_RESULTS = frozenset({"passed", "failed", "review", "annulled"})
+# Only a passed exam opens access; review/annulled/failed all map to ESMO_FAIL.
+_RESULT_TO_EVENT_TYPE = {"passed": EventType.ESMO_OK}
+
+# ESMO portal timestamps are Asia/Tashkent wall-clock time.
+_LOCAL_TZ = timezone(timedelta(hours=5))
+# "%d.%m.%Y %H:%M" with optional ":%S"; strptime re-parses its format on every call.
+_RE_ESMO_TIMESTAMP = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})\s+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?")
+
+# Exam rows per multi-row upsert statement; the whole cycle still commits once.
+_UPSERT_BATCH_SIZE = 500
+# Upper bound for bound parameters in a single IN (...) prefetch query.
+_IN_CLAUSE_CHUNK = 1000
+# Concurrent MO detail page fetches while repairing incomplete exams.
+_DETAIL_FETCH_WORKERS = 8
+# Poll cycles run one at a time on their own thread so long scrapes never queue behind
+# (or starve) other blocking work on the loop's default executor.
+_esmo_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="esmo-poll")
+# Idle polls stretch the sleep up to this multiple of ESMO_POLL_INTERVAL.
+_MAX_IDLE_BACKOFF_FACTOR = 10
+_TERMINAL_SYNC_INTERVAL_SECONDS = 3600
+_last_terminal_sync: float | None = None
+# Logged-in portal client shared by poll cycles; guarded by the lock.
+_poll_client_lock = threading.Lock()
+_poll_client: EsmoClient | None = None
+# Id of the synthetic ESMO_PORTAL device, cached after the first lookup.
+_esmo_device_id: int | None = None
+# The recent-pages safety net re-reads pages the incremental fetch normally covers;
+# run it on the first poll and then by wall-clock time, so idle backoff cannot stretch it.
+_SAFETY_NET_INTERVAL_SECONDS = 300
+_last_safety_net: float | None = None
+
 ESMO_TERMINALS: list[dict[str, str]] = [
     {
         "name": "TKM 1-terminal",
@@ -75,12 +114,23 @@ _TERMINAL_SLOT_TO_TKM_NUM = {
     "9": "3",
     "10": "4",
 }
+_ALLOWED_TERMINAL_NAMES = frozenset(_TERMINALS_BY_NAME)
+_ALLOWED_TERMINAL_CODES = frozenset(t["device_code"] for t in ESMO_TERMINALS)
+_ALLOWED_TERMINAL_HOSTS = frozenset(t["host"] for t in ESMO_TERMINALS)
+_TERMINALS_BY_LOWER_NAME = {" ".join(name.split()).lower(): info for name, info in _TERMINALS_BY_NAME.items()}
+_RE_TERMINAL_NAME = re.compile("|".join(re.escape(name) for name in _TERMINALS_BY_NAME), re.IGNORECASE)
+_RE_TKM = re.compile(r"\bTKM\s*([1-4])\s*-\s*terminal\b", re.IGNORECASE)
+_RE_SLOT = re.compile(r"\bterminal\s*\[(\d{1,3})\]", re.IGNORECASE)
+_RE_PLAIN = re.compile(r"\d{1,3}")
 
 
-def get_allowed_esmo_terminal_names() -> set[str]:
-    return set(_TERMINALS_BY_NAME.keys())
+def get_allowed_esmo_terminal_names() -> frozenset[str]:
+    return _ALLOWED_TERMINAL_NAMES
 
 
+# Pages repeat a handful of terminal labels; results are the shared ESMO_TERMINALS
+# entries, so cached values are never copied or mutated by callers.
+@lru_cache(maxsize=256)
 def _resolve_esmo_terminal(raw_terminal_name: str | None) -> dict[str, str] | None:
     if not raw_terminal_name:
         return None
@@ -88,24 +138,28 @@ def _resolve_esmo_terminal(raw_terminal_name: str | None) -> dict[str, str] | No
     if not text:
         return None
 
-    lowered = text.lower()
-    for name, info in _TERMINALS_BY_NAME.items():
-        if name.lower() in lowered:
-            return info
+    # Journal rows usually carry the bare terminal name; skip the pattern scan then.
+    exact = _TERMINALS_BY_LOWER_NAME.get(text.lower())
+    if exact:
+        return exact
+
+    name_match = _RE_TERMINAL_NAME.search(text)
+    if name_match:
+        return _TERMINALS_BY_LOWER_NAME[name_match.group(0).lower()]
 
-    match = re.search(r"\bTKM\s*([1-4])\s*-\s*terminal\b", text, flags=re.IGNORECASE)
+    match = _RE_TKM.search(text)
     if match:
         return _TERMINALS_BY_NUM.get(match.group(1))
 
     # Example: "terminal [10]" -> TKM 4-terminal
-    slot_match = re.search(r"\bterminal\s*\[(\d{1,3})\]", text, flags=re.IGNORECASE)
+    slot_match = _RE_SLOT.search(text)
     if slot_match:
         tkm_num = _TERMINAL_SLOT_TO_TKM_NUM.get(slot_match.group(1))
         if tkm_num:
             return _TERMINALS_BY_NUM.get(tkm_num)
 
     # Example from compact rows: plain "10"
-    plain_num = re.fullmatch(r"\d{1,3}", text)
+    plain_num = _RE_PLAIN.fullmatch(text)
     if plain_num:
         tkm_num = _TERMINAL_SLOT_TO_TKM_NUM.get(plain_num.group(0))
         if tkm_num:
@@ -119,8 +173,6 @@ def _sync_allowed_esmo_devices(db: Session) -> int:
     """
     created = 0
     now = datetime.now(timezone.utc)
-    allowed_codes = {t["device_code"] for t in ESMO_TERMINALS}
-    allowed_hosts = {t["host"] for t in ESMO_TERMINALS}
 
     for terminal in ESMO_TERMINALS:
         existing = db.query(Device).filter(Device.device_code == terminal["device_code"]).first()
@@ -157,42 +209,73 @@ def _sync_allowed_esmo_devices(db: Session) -> int:
             )
             created += 1
 
-    extra_esmo_devices = (
-        db.query(Device)
-        .filter(
+    # Keep history safe: disable extra ESMO devices instead of hard delete.
+    # One UPDATE; nothing is loaded into the session.
+    db.execute(
+        update(Device)
+        .where(
             Device.device_type == DeviceType.ESMO,
-            Device.device_code != "ESMO_PORTAL",
-            ~Device.device_code.in_(allowed_codes),
+            Device.is_active.is_(True),
+            Device.device_code.notin_(_ALLOWED_TERMINAL_CODES | {"ESMO_PORTAL"}),
+            or_(Device.host.is_(None), Device.host.notin_(_ALLOWED_TERMINAL_HOSTS)),
         )
-        .all()
+        .values(is_active=False)
     )
-    for device in extra_esmo_devices:
-        if device.host and device.host in allowed_hosts:
-            continue
-        # Keep history safe: disable extra ESMO devices instead of hard delete.
-        device.is_active = False
 
     db.flush()
     return created
 
-def _find_employee(db: Session, pass_id: str, full_name: str) -> Optional[Employee]:
+def _prefetch_esmo_employees(db: Session, pass_ids: list[str]) -> dict[str, Employee]:
+    """Map ESMO pass ids to employees; ESMO external-id links win over employee_no matches."""
+    employees_by_pass_id: dict[str, Employee] = {}
+    for chunk in _chunked(pass_ids):
+        for emp in db.query(Employee).filter(Employee.employee_no.in_(chunk)):
+            employees_by_pass_id.setdefault(emp.employee_no, emp)
+    for chunk in _chunked(pass_ids):
+        linked = (
+            db.query(EmployeeExternalID.external_id, Employee)
+            .join(Employee, Employee.id == EmployeeExternalID.employee_id)
+            .filter(EmployeeExternalID.system == "ESMO", EmployeeExternalID.external_id.in_(chunk))
+        )
+        for external_id, emp in linked:
+            employees_by_pass_id[external_id] = emp
+    return employees_by_pass_id
+
+
+def _find_employee(
+    db: Session,
+    pass_id: str,
+    full_name: str,
+    employees_by_pass_id: dict[str, Employee] | None = None,
+) -> Optional[Employee]:
     """
     Find employee by ESMO Pass ID or Name.
     1. Check EmployeeExternalID (system='ESMO')
     2. Fallback to Employee.employee_no (if pass_id matches)
     3. Fallback to name search
+
+    With a prefetched ``employees_by_pass_id`` map, steps 1-2 are a dict lookup.
     """
-    if pass_id:
-        # 1. External ID
-        ext = db.query(EmployeeExternalID).filter(
-            EmployeeExternalID.system == "ESMO",
-            EmployeeExternalID.external_id == pass_id
-        ).first()
-        if ext:
-            return db.get(Employee, ext.employee_id)
-        
-        # 2. Direct employee_no match
-        emp = db.query(Employee).filter(Employee.employee_no == pass_id).first()
+    if pass_id and employees_by_pass_id is not None:
+        emp = employees_by_pass_id.get(pass_id)
+        if emp:
+            return emp
+    elif pass_id:
+        # 1 + 2 in one round-trip: external-ID matches sort ahead of employee_no matches.
+        emp = (
+            db.query(Employee)
+            .outerjoin(
+                EmployeeExternalID,
+                and_(
+                    EmployeeExternalID.employee_id == Employee.id,
+                    EmployeeExternalID.system == "ESMO",
+                    EmployeeExternalID.external_id == pass_id,
+                ),
+            )
+            .filter(or_(EmployeeExternalID.id.isnot(None), Employee.employee_no == pass_id))
+            .order_by(EmployeeExternalID.id.is_(None))
+            .first()
+        )
         if emp:
             return emp
 
@@ -212,20 +295,27 @@ def _find_employee(db: Session, pass_id: str, full_name: str) -> Optional[Employ
 
 
 def _split_full_name(full_name: str) -> tuple[str, str, str | None]:
-    parts = [p for p in (full_name or "").split() if p]
+    # str.split() never yields empty parts; the tail is re-split to normalise its spacing.
+    parts = (full_name or "").split(None, 2)
     if not parts:
         return "Unknown", "", None
-    last_name = parts[0]
-    first_name = parts[1] if len(parts) > 1 else ""
-    patronymic = " ".join(parts[2:]) if len(parts) > 2 else None
-    return last_name, first_name, patronymic
+    if len(parts) == 1:
+        return parts[0], "", None
+    if len(parts) == 2:
+        return parts[0], parts[1], None
+    return parts[0], parts[1], " ".join(parts[2].split())
 
 
-def _find_or_create_employee_for_esmo(db: Session, pass_id: str | None, full_name: str | None) -> Optional[Employee]:
+def _find_or_create_employee_for_esmo(
+    db: Session,
+    pass_id: str | None,
+    full_name: str | None,
+    employees_by_pass_id: dict[str, Employee] | None = None,
+) -> Optional[Employee]:
     pass_id = (pass_id or "").strip()
     full_name = (full_name or "").strip()
 
-    existing = _find_employee(db, pass_id, full_name)
+    existing = _find_employee(db, pass_id, full_name, employees_by_pass_id)
     if existing:
         # Backfill incomplete profile fields from ESMO full name when available.
         if full_name:
@@ -239,7 +329,9 @@ def _find_or_create_employee_for_esmo(db: Session, pass_id: str | None, full_nam
                 existing.last_name = last_name
             if first_name and not (existing.first_name or "").strip():
                 existing.first_name = first_name
-            db.flush()
+            # Most rows change nothing; only pay for a flush when a field was backfilled.
+            if db.is_modified(existing):
+                db.flush()
         return existing
 
     if not pass_id:
@@ -254,41 +346,37 @@ def _find_or_create_employee_for_esmo(db: Session, pass_id: str | None, full_nam
         patronymic=patronymic,
         is_active=True,
     )
+    # The unit of work inserts the employee before its link, so one flush covers both.
+    employee.external_ids.append(EmployeeExternalID(system="ESMO", external_id=pass_id))
     db.add(employee)
     db.flush()
-
-    db.add(
-        EmployeeExternalID(
-            employee_id=employee.id,
-            system="ESMO",
-            external_id=pass_id,
-        )
-    )
-    db.flush()
+    if employees_by_pass_id is not None:
+        employees_by_pass_id[pass_id] = employee
     return employee
 
 def _parse_esmo_time_local(time_str: str) -> datetime:
     """Parse ESMO local time string to timezone-aware Asia/Tashkent(+05:00)."""
-    local_tz = timezone(timedelta(hours=5))
-    text = (time_str or "").strip()
-    for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S"):
+    match = _RE_ESMO_TIMESTAMP.fullmatch((time_str or "").strip())
+    if match:
+        day, month, year, hour, minute, second = match.groups()
         try:
-            dt = datetime.strptime(text, fmt)
-            return dt.replace(tzinfo=local_tz)
-        except Exception:
-            continue
-    return datetime.now(local_tz)
+            return datetime(
+                int(year), int(month), int(day), int(hour), int(minute), int(second or 0), tzinfo=_LOCAL_TZ
+            )
+        except ValueError:
+            pass
+    return datetime.now(_LOCAL_TZ)
 
 
-def _parse_esmo_time_utc(time_str: str) -> datetime:
-    """Parse ESMO local time string and convert to UTC."""
-    return _parse_esmo_time_local(time_str).astimezone(timezone.utc)
+def _parse_esmo_time_both(time_str: str) -> tuple[datetime, datetime]:
+    """Parse once and return (local naive, UTC) for the exam row and its event."""
+    local = _parse_esmo_time_local(time_str)
+    return local.replace(tzinfo=None), local.astimezone(timezone.utc)
 
 
 def _local_naive_to_utc(dt_local_naive: datetime) -> datetime:
-    local_tz = timezone(timedelta(hours=5))
     if dt_local_naive.tzinfo is None:
-        return dt_local_naive.replace(tzinfo=local_tz).astimezone(timezone.utc)
+        return dt_local_naive.replace(tzinfo=_LOCAL_TZ).astimezone(timezone.utc)
     return dt_local_naive.astimezone(timezone.utc)
 
 def _get_or_create_esmo_device(db: Session) -> Device:
@@ -319,6 +407,20 @@ def _get_or_create_esmo_device(db: Session) -> Device:
     return device
 
 
+def _touch_esmo_device(db: Session) -> int:
+    """Return the ESMO portal device id; once known, only last_seen is bumped."""
+    global _esmo_device_id
+    if _esmo_device_id is not None:
+        touched = db.execute(
+            update(Device).where(Device.id == _esmo_device_id).values(last_seen=datetime.now(timezone.utc))
+        )
+        if touched.rowcount:
+            return _esmo_device_id
+    # First poll, or the cached row is gone (deleted, or its insert was rolled back).
+    _esmo_device_id = _get_or_create_esmo_device(db).id
+    return _esmo_device_id
+
+
 def _repair_recent_incomplete_exams(
     db: Session,
     client: EsmoClient,
@@ -329,10 +431,6 @@ def _repair_recent_incomplete_exams(
     Backfill pulse/temperature and other missing details for recent ESMO exams.
     This protects against parser/layout changes where initial ingest saved partial data.
     """
-    if not client.is_logged_in and not client.login():
-        return 0
-
-    allowed_terminal_names = tuple(get_allowed_esmo_terminal_names())
     rows = (
         db.query(MedicalExam)
         .filter(
@@ -341,7 +439,7 @@ def _repair_recent_incomplete_exams(
                 MedicalExam.pulse.is_(None)
                 | MedicalExam.temperature.is_(None)
                 | MedicalExam.terminal_name.is_(None)
-                | (~MedicalExam.terminal_name.in_(allowed_terminal_names))
+                | (~MedicalExam.terminal_name.in_(_ALLOWED_TERMINAL_NAMES))
             ),
         )
         .order_by(MedicalExam.esmo_id.desc())
@@ -349,13 +447,41 @@ def _repair_recent_incomplete_exams(
         .all()
     )
 
-    repaired = 0
+    # Rows with complete vitals whose stored terminal label still resolves locally only
+    # need a rename; everything else needs the MO detail page.
+    renamed = 0
+    needs_detail: list[MedicalExam] = []
     for exam in rows:
-        esmo_id = exam.esmo_id
-        if esmo_id is None:
+        if exam.esmo_id is None:
             continue
+        if exam.pulse is not None and exam.temperature is not None:
+            terminal_meta = _resolve_esmo_terminal(exam.terminal_name)
+            if terminal_meta:
+                exam.terminal_name = terminal_meta["name"]
+                renamed += 1
+                continue
+        needs_detail.append(exam)
+
+    if renamed:
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            renamed = 0
 
-        detail = client._fetch_exam_detail(int(esmo_id))
+    if not needs_detail:
+        return renamed
+    if not client.is_logged_in and not client.login():
+        return renamed
+
+    # Detail pages are independent HTTP round-trips; fetch them concurrently and keep
+    # all session work on this thread.
+    with ThreadPoolExecutor(max_workers=_DETAIL_FETCH_WORKERS) as pool:
+        details = list(pool.map(client._fetch_exam_detail, [int(exam.esmo_id) for exam in needs_detail]))
+
+    repaired = 0
+    for exam, detail in zip(needs_detail, details):
+        esmo_id = exam.esmo_id
         if not detail:
             continue
 
@@ -367,24 +493,29 @@ def _repair_recent_incomplete_exams(
             changed = True
 
         parsed_result = (detail.get("result") or "").strip().lower()
-        if parsed_result in {"passed", "failed", "review", "annulled"} and exam.result != parsed_result:
+        if parsed_result in _VALID_EXAM_RESULTS and exam.result != parsed_result:
             exam.result = parsed_result
             changed = True
 
-        if detail.get("pressure_systolic") is not None and exam.pressure_systolic != detail.get("pressure_systolic"):
-            exam.pressure_systolic = detail.get("pressure_systolic")
+        pressure_systolic = detail.get("pressure_systolic")
+        if pressure_systolic is not None and exam.pressure_systolic != pressure_systolic:
+            exam.pressure_systolic = pressure_systolic
             changed = True
-        if detail.get("pressure_diastolic") is not None and exam.pressure_diastolic != detail.get("pressure_diastolic"):
-            exam.pressure_diastolic = detail.get("pressure_diastolic")
+        pressure_diastolic = detail.get("pressure_diastolic")
+        if pressure_diastolic is not None and exam.pressure_diastolic != pressure_diastolic:
+            exam.pressure_diastolic = pressure_diastolic
             changed = True
-        if detail.get("pulse") is not None and exam.pulse != detail.get("pulse"):
-            exam.pulse = detail.get("pulse")
+        pulse = detail.get("pulse")
+        if pulse is not None and exam.pulse != pulse:
+            exam.pulse = pulse
             changed = True
-        if detail.get("temperature") is not None and exam.temperature != detail.get("temperature"):
-            exam.temperature = detail.get("temperature")
+        temperature = detail.get("temperature")
+        if temperature is not None and exam.temperature != temperature:
+            exam.temperature = temperature
             changed = True
-        if detail.get("alcohol_mg_l") is not None and exam.alcohol_mg_l != detail.get("alcohol_mg_l"):
-            exam.alcohol_mg_l = detail.get("alcohol_mg_l")
+        alcohol_mg_l = detail.get("alcohol_mg_l")
+        if alcohol_mg_l is not None and exam.alcohol_mg_l != alcohol_mg_l:
+            exam.alcohol_mg_l = alcohol_mg_l
             changed = True
 
         if changed:
@@ -395,90 +526,198 @@ def _repair_recent_incomplete_exams(
             )
             if event:
                 event.event_ts = _local_naive_to_utc(exam.timestamp)
-                event.event_type = EventType.ESMO_OK if exam.result == "passed" else EventType.ESMO_FAIL
+                event.event_type = _RESULT_TO_EVENT_TYPE.get(exam.result, EventType.ESMO_FAIL)
+            repaired += 1
 
-            try:
-                db.commit()
-                repaired += 1
-            except IntegrityError:
-                db.rollback()
+    if not repaired:
+        return renamed
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return renamed
+    return renamed + repaired
+
+def _chunked(values: list, size: int = _IN_CLAUSE_CHUNK):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _count_missing_esmo_ids(db: Session, esmo_ids: list[int]) -> int:
+    """Count ids not stored yet; the set difference runs in Postgres via unnest()."""
+    candidates = func.unnest(literal(esmo_ids, ARRAY(Integer))).table_valued("esmo_id").render_derived(name="candidate")
+    stmt = (
+        select(func.count())
+        .select_from(candidates)
+        .where(~exists().where(MedicalExam.esmo_id == candidates.c.esmo_id))
+    )
+    return int(db.execute(stmt).scalar() or 0)
+
+
+def _prefetch_exam_results(db: Session, esmo_ids: list[int]) -> dict[int, str]:
+    results_by_id: dict[int, str] = {}
+    for chunk in _chunked(esmo_ids):
+        for esmo_id, result in db.query(MedicalExam.esmo_id, MedicalExam.result).filter(MedicalExam.esmo_id.in_(chunk)):
+            results_by_id[int(esmo_id)] = result
+    return results_by_id
+
+
+def _upsert_medical_exams(db: Session, rows: list[dict]) -> None:
+    table = MedicalExam.__table__
+    stmt = pg_insert(table).values(rows)
+    excluded = stmt.excluded
+    # Keep historical records corrected if parser improves or manual-review state appears
+    # later, but never wipe stored vitals with values missing from this scrape.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.esmo_id],
+        set_={
+            "employee_id": excluded.employee_id,
+            "terminal_name": excluded.terminal_name,
+            "result": excluded.result,
+            "timestamp": excluded.timestamp,
+            "pressure_systolic": func.coalesce(excluded.pressure_systolic, table.c.pressure_systolic),
+            "pressure_diastolic": func.coalesce(excluded.pressure_diastolic, table.c.pressure_diastolic),
+            "pulse": func.coalesce(excluded.pulse, table.c.pulse),
+            "temperature": func.coalesce(excluded.temperature, table.c.temperature),
+            "alcohol_mg_l": func.coalesce(excluded.alcohol_mg_l, table.c.alcohol_mg_l),
+        },
+    )
+    db.execute(stmt)
+
+
+def _upsert_esmo_events(db: Session, rows: list[dict]) -> None:
+    table = Event.__table__
+    stmt = pg_insert(table).values(rows)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.device_id, table.c.raw_id],
+        set_={
+            "event_type": excluded.event_type,
+            "event_ts": excluded.event_ts,
+            "source_payload": excluded.source_payload,
+        },
+    )
+    db.execute(stmt)
+
+
+def _write_esmo_batch(db: Session, batch: list[tuple[dict, dict, bool]]) -> int:
+    """Upsert exams and their events; returns how many exams were new."""
+    try:
+        with db.begin_nested():
+            _upsert_medical_exams(db, [exam_row for exam_row, _, _ in batch])
+            _upsert_esmo_events(db, [event_row for _, event_row, _ in batch])
+        return sum(1 for _, _, is_new in batch if is_new)
+    except IntegrityError as exc:
+        logger.warning("ESMO Poller: batch upsert failed, retrying row by row: %s", exc.orig)
+
+    saved = 0
+    for exam_row, event_row, is_new in batch:
+        try:
+            with db.begin_nested():
+                _upsert_medical_exams(db, [exam_row])
+                _upsert_esmo_events(db, [event_row])
+        except IntegrityError:
+            logger.debug("ESMO Poller: integrity error for esmo_id=%s, row skipped", exam_row["esmo_id"])
+            continue
+        if is_new:
+            saved += 1
+    return saved
+
+
+def _get_poll_client() -> EsmoClient:
+    global _poll_client
+    if _poll_client is None:
+        _poll_client = EsmoClient(
+            base_url=settings.ESMO_BASE_URL,
+            username=settings.ESMO_USER,
+            password=settings.ESMO_PASS,
+            timeout=settings.ESMO_REQUEST_TIMEOUT,
+            login_retries=settings.ESMO_LOGIN_RETRIES,
+        )
+    return _poll_client
 
-    return repaired
 
 def poll_esmo_once() -> int:
     """Fetch latest exams from ESMO and save to local DB."""
     if not settings.ESMO_ENABLED:
         return 0
 
-    client = EsmoClient(
-        base_url=settings.ESMO_BASE_URL,
-        username=settings.ESMO_USER,
-        password=settings.ESMO_PASS,
-        timeout=settings.ESMO_REQUEST_TIMEOUT,
-        login_retries=settings.ESMO_LOGIN_RETRIES,
-    )
+    # Reuse one logged-in portal session across cycles; the lock also serializes
+    # manual sync requests with the background loop.
+    with _poll_client_lock:
+        client = _get_poll_client()
+        client.clear_detail_cache()
+        return _poll_esmo_with_client(client)
 
-    probe_db: Session = SessionLocal()
-    try:
-        last_known_esmo_id = probe_db.query(func.max(MedicalExam.esmo_id)).scalar()
-    finally:
-        probe_db.close()
-
-    # Keep each poll cycle bounded so latest exams appear quickly in UI.
-    # Deep backfill can take a long time and block the first cycle.
-    configured_backfill_pages = max(settings.ESMO_BACKFILL_MAX_PAGES, 1)
-    cycle_backfill_pages = min(configured_backfill_pages, 12)
-    exams = client.fetch_exams_since(
-        since_esmo_id=last_known_esmo_id,
-        max_pages=cycle_backfill_pages,
-    )
-    # Safety-net backfill: re-read recent pages and import rows missing in local DB.
-    # This prevents data holes after temporary parser/layout changes or short outages.
-    recent_pages = min(configured_backfill_pages, 4)
-    recent_candidates = client.fetch_exams_since(since_esmo_id=None, max_pages=recent_pages)
-    if recent_candidates:
-        candidate_ids = [int(r["esmo_id"]) for r in recent_candidates if isinstance(r.get("esmo_id"), int)]
-        existing_ids: set[int] = set()
-        if candidate_ids:
-            probe_db2: Session = SessionLocal()
-            try:
-                existing_ids = {
-                    int(row[0])
-                    for row in probe_db2.query(MedicalExam.esmo_id).filter(MedicalExam.esmo_id.in_(candidate_ids)).all()
-                    if row[0] is not None
-                }
-            finally:
-                probe_db2.close()
-
-        missing_recent = [r for r in recent_candidates if isinstance(r.get("esmo_id"), int) and int(r["esmo_id"]) not in existing_ids]
-        merged_by_id: dict[int, dict] = {
-            int(r["esmo_id"]): r for r in recent_candidates if isinstance(r.get("esmo_id"), int)
-        }
-        for row in exams:
-            if isinstance(row.get("esmo_id"), int):
-                merged_by_id[int(row["esmo_id"])] = row
-        exams = sorted(merged_by_id.values(), key=lambda x: int(x.get("esmo_id") or 0), reverse=True)
-        if missing_recent:
-            logger.info("ESMO Poller: added %d missing rows from recent %d pages", len(missing_recent), recent_pages)
 
-    if not exams and client.last_error:
-        logger.warning("ESMO poll returned no exams: %s", client.last_error)
+def _poll_esmo_with_client(client: EsmoClient) -> int:
+    global _last_terminal_sync, _last_safety_net
 
-    if configured_backfill_pages > cycle_backfill_pages:
-        logger.info(
-            "ESMO Poller: limiting this cycle to %d pages (configured backfill=%d)",
-            cycle_backfill_pages,
-            configured_backfill_pages,
-        )
+    # One session serves the whole poll; short read transactions are committed
+    # right away so the pooled connection is not held open while scraping.
+    db: Session = SessionLocal()
+    try:
+        last_known_esmo_id = db.query(func.max(MedicalExam.esmo_id)).scalar()
+        db.commit()
 
-    if last_known_esmo_id:
-        logger.info(
-            "ESMO Poller: fetched %d candidate rows since esmo_id=%s",
-            len(exams),
-            last_known_esmo_id,
+        # Keep each poll cycle bounded so latest exams appear quickly in UI.
+        # Deep backfill can take a long time and block the first cycle.
+        configured_backfill_pages = max(settings.ESMO_BACKFILL_MAX_PAGES, 1)
+        cycle_backfill_pages = min(configured_backfill_pages, 12)
+        exams = client.fetch_exams_since(
+            since_esmo_id=last_known_esmo_id,
+            max_pages=cycle_backfill_pages,
         )
+        if not exams and client.last_error and client.is_logged_in:
+            # Expired portal sessions render the login form instead of journal rows.
+            client.is_logged_in = False
+            exams = client.fetch_exams_since(
+                since_esmo_id=last_known_esmo_id,
+                max_pages=cycle_backfill_pages,
+            )
+        # Safety-net backfill: re-read recent pages and import rows missing in local DB.
+        # This prevents data holes after temporary parser/layout changes or short outages.
+        recent_pages = min(configured_backfill_pages, 4)
+        recent_candidates: list[dict] = []
+        if _last_safety_net is None or time.monotonic() - _last_safety_net >= _SAFETY_NET_INTERVAL_SECONDS:
+            recent_candidates = client.fetch_exams_since(since_esmo_id=None, max_pages=recent_pages)
+            _last_safety_net = time.monotonic()
+        if recent_candidates:
+            candidate_ids = list({int(r["esmo_id"]) for r in recent_candidates if isinstance(r.get("esmo_id"), int)})
+            missing_recent = 0
+            if candidate_ids:
+                missing_recent = _count_missing_esmo_ids(db, candidate_ids)
+                db.commit()
+
+            # Rows from the incremental fetch win; recent-page rows only fill the gaps.
+            # The ingest loop does not depend on order, so no re-sort is needed.
+            exam_ids = {r["esmo_id"] for r in exams if isinstance(r.get("esmo_id"), int)}
+            exams.extend(
+                r for r in recent_candidates if isinstance(r.get("esmo_id"), int) and r["esmo_id"] not in exam_ids
+            )
+            if missing_recent:
+                logger.info("ESMO Poller: added %d missing rows from recent %d pages", missing_recent, recent_pages)
+
+        if not exams and client.last_error:
+            logger.warning("ESMO poll returned no exams: %s", client.last_error)
+
+        if configured_backfill_pages > cycle_backfill_pages:
+            logger.info(
+                "ESMO Poller: limiting this cycle to %d pages (configured backfill=%d)",
+                cycle_backfill_pages,
+                configured_backfill_pages,
+            )
+
+        if last_known_esmo_id:
+            logger.info(
+                "ESMO Poller: fetched %d candidate rows since esmo_id=%s",
+                len(exams),
+                last_known_esmo_id,
+            )
+    except Exception:
+        db.close()
+        raise
 
-    db: Session = SessionLocal()
     saved_count = 0
     repaired_count = 0
     unmatched_count = 0
@@ -486,26 +725,42 @@ def poll_esmo_once() -> int:
     disabled_terminal_count = 0
     poll_error: str | None = None
     try:
-        esmo_device = _get_or_create_esmo_device(db)
-        created_terminal_devices = _sync_allowed_esmo_devices(db)
+        esmo_device_id = _touch_esmo_device(db)
+        # The approved terminal list only changes with deploys; re-sync it hourly.
+        sync_due = _last_terminal_sync is None or time.monotonic() - _last_terminal_sync >= _TERMINAL_SYNC_INTERVAL_SECONDS
+        created_terminal_devices = _sync_allowed_esmo_devices(db) if sync_due else 0
         db.commit()
-        db.refresh(esmo_device)
+        if sync_due:
+            _last_terminal_sync = time.monotonic()
         terminal_active_by_code = {
             str(d.device_code): bool(d.is_active)
             for d in db.query(Device)
             .filter(
                 Device.device_type == DeviceType.ESMO,
-                Device.device_code.in_([t["device_code"] for t in ESMO_TERMINALS]),
+                Device.device_code.in_(_ALLOWED_TERMINAL_CODES),
             )
             .all()
         }
         if created_terminal_devices:
             logger.info("ESMO Poller: Added %d terminal devices", created_terminal_devices)
 
+        # Prefetch stored results for this cycle; rows with an unreliable parsed result
+        # keep the stored one, and unknown ids count as newly saved.
+        candidate_ids = [int(ex["esmo_id"]) for ex in exams if ex.get("esmo_id")]
+        existing_result_by_id = _prefetch_exam_results(db, candidate_ids)
+        # One lookup for every pass id in the cycle instead of a query per exam row.
+        pass_ids = list({str(ex["employee_pass_id"]).strip() for ex in exams if ex.get("employee_pass_id")})
+        employees_by_pass_id = _prefetch_esmo_employees(db, pass_ids)
+
+        batch: list[tuple[dict, dict, bool]] = []
+        batch_ids: set[int] = set()
         for ex in exams:
             esmo_id = ex.get("esmo_id")
             if not esmo_id:
                 continue
+            # ON CONFLICT cannot touch the same row twice in one statement.
+            if esmo_id in batch_ids:
+                continue
 
             terminal_meta = _resolve_esmo_terminal(ex.get("terminal"))
             if not terminal_meta:
@@ -520,22 +775,26 @@ def poll_esmo_once() -> int:
             # Find employee
             pass_id = ex.get("employee_pass_id")
             emp_name = ex.get("employee_name")
-            employee = _find_or_create_employee_for_esmo(db, pass_id, emp_name)
-            
+            try:
+                with db.begin_nested():
+                    employee = _find_or_create_employee_for_esmo(db, pass_id, emp_name, employees_by_pass_id)
+            except IntegrityError:
+                logger.debug("ESMO Poller: employee upsert conflict for esmo_id=%s, row skipped", esmo_id)
+                continue
+
             if not employee:
                 logger.debug("Employee not found for ESMO exam: %s (Pass ID: %s)", emp_name, pass_id)
                 unmatched_count += 1
                 continue
 
-            exam_ts_local_naive = _parse_esmo_time_local(str(ex.get("timestamp") or "")).replace(tzinfo=None)
-            exam_ts_utc = _parse_esmo_time_utc(str(ex.get("timestamp") or ""))
+            timestamp_text = str(ex.get("timestamp") or "")
+            exam_ts_local_naive, exam_ts_utc = _parse_esmo_time_both(timestamp_text)
 
-            # Upsert medical exam record.
-            existing_exam = db.query(MedicalExam).filter(MedicalExam.esmo_id == esmo_id).first()
+            existing_result = existing_result_by_id.get(esmo_id)
             parsed_result = (ex.get("result") or "").strip().lower()
-            if parsed_result not in {"passed", "failed", "review", "annulled"}:
-                if existing_exam:
-                    result = existing_exam.result
+            if parsed_result not in _VALID_EXAM_RESULTS:
+                if existing_result is not None:
+                    result = existing_result
                     logger.debug("ESMO Poller: keep existing result=%s for esmo_id=%s (parsed=%r)", result, esmo_id, parsed_result)
                 else:
                     # Skip incomplete rows to avoid false "failed" in MainTrack.
@@ -544,72 +803,43 @@ def poll_esmo_once() -> int:
             else:
                 result = parsed_result
 
-            if not existing_exam:
-                exam_record = MedicalExam(
-                    employee_id=employee.id,
-                    esmo_id=esmo_id,
-                    terminal_name=terminal_name,
-                    result=result,
-                    pressure_systolic=ex.get("pressure_systolic"),
-                    pressure_diastolic=ex.get("pressure_diastolic"),
-                    pulse=ex.get("pulse"),
-                    temperature=ex.get("temperature"),
-                    alcohol_mg_l=ex.get("alcohol_mg_l"),
-                    timestamp=exam_ts_local_naive,
-                )
-                db.add(exam_record)
-                saved_count += 1
-            else:
-                # Keep historical records corrected if parser improves or manual-review state appears later.
-                existing_exam.employee_id = employee.id
-                existing_exam.terminal_name = terminal_name
-                if result:
-                    existing_exam.result = result
-                existing_exam.timestamp = exam_ts_local_naive
-                if ex.get("pressure_systolic") is not None:
-                    existing_exam.pressure_systolic = ex.get("pressure_systolic")
-                if ex.get("pressure_diastolic") is not None:
-                    existing_exam.pressure_diastolic = ex.get("pressure_diastolic")
-                if ex.get("pulse") is not None:
-                    existing_exam.pulse = ex.get("pulse")
-                if ex.get("temperature") is not None:
-                    existing_exam.temperature = ex.get("temperature")
-                if ex.get("alcohol_mg_l") is not None:
-                    existing_exam.alcohol_mg_l = ex.get("alcohol_mg_l")
-
+            exam_row = {
+                "employee_id": employee.id,
+                "esmo_id": esmo_id,
+                "terminal_name": terminal_name,
+                "result": result,
+                "pressure_systolic": ex.get("pressure_systolic"),
+                "pressure_diastolic": ex.get("pressure_diastolic"),
+                "pulse": ex.get("pulse"),
+                "temperature": ex.get("temperature"),
+                "alcohol_mg_l": ex.get("alcohol_mg_l"),
+                "timestamp": exam_ts_local_naive,
+            }
             # Ensure a corresponding Event exists so access logic/reports can use it.
-            event_raw_id = f"esmo:{esmo_id}"
-            existing_event = (
-                db.query(Event)
-                .filter(Event.device_id == esmo_device.id, Event.raw_id == event_raw_id)
-                .first()
-            )
-            if not existing_event:
-                event_type = EventType.ESMO_OK if result == "passed" else EventType.ESMO_FAIL
-                db.add(
-                    Event(
-                        device_id=esmo_device.id,
-                        employee_id=employee.id,
-                        event_type=event_type,
-                        event_ts=exam_ts_utc,
-                        raw_id=event_raw_id,
-                        status=EventStatus.ACCEPTED,
-                        reject_reason=None,
-                        source_payload=ex,
-                    )
-                )
-            else:
-                existing_event.event_type = EventType.ESMO_OK if result == "passed" else EventType.ESMO_FAIL
-                existing_event.event_ts = exam_ts_utc
-                existing_event.source_payload = ex
-
-            try:
-                db.commit()
-            except IntegrityError:
-                db.rollback()
+            event_row = {
+                "device_id": esmo_device_id,
+                "employee_id": employee.id,
+                "event_type": _RESULT_TO_EVENT_TYPE.get(result, EventType.ESMO_FAIL),
+                "event_ts": exam_ts_utc,
+                "received_ts": datetime.now(timezone.utc),
+                "raw_id": f"esmo:{esmo_id}",
+                "status": EventStatus.ACCEPTED,
+                "reject_reason": None,
+                "source_payload": ex,
+            }
+            batch.append((exam_row, event_row, existing_result is None))
+            batch_ids.add(esmo_id)
+
+            if len(batch) >= _UPSERT_BATCH_SIZE:
+                saved_count += _write_esmo_batch(db, batch)
+                batch.clear()
+
+        if batch:
+            saved_count += _write_esmo_batch(db, batch)
+        db.commit()
 
         # Keep repair in small batches to avoid blocking the regular polling cycle.
-        repaired_count = _repair_recent_incomplete_exams(db, client, esmo_device.id, limit=10)
+        repaired_count = _repair_recent_incomplete_exams(db, client, esmo_device_id, limit=10)
 
         if saved_count > 0:
             logger.info("ESMO Poller: Saved %d new medical exams", saved_count)
@@ -645,20 +875,24 @@ def poll_esmo_once() -> int:
             poll_error or "none",
         )
         db.close()
-        client.close()
-    
+
     return saved_count + repaired_count
 
 async def esmo_polling_loop():
     """Background async loop for ESMO polling."""
     interval = max(settings.ESMO_POLL_INTERVAL, 10)
     logger.info("ESMO Polling started (interval: %ds)", interval)
-    
+
+    idle_cycles = 0
     while True:
+        changed = 0
         try:
-            # Run blocking scrape in executor
-            await asyncio.get_event_loop().run_in_executor(None, poll_esmo_once)
+            # Run blocking scrape on the dedicated ESMO worker, not the shared default pool.
+            changed = await asyncio.get_running_loop().run_in_executor(_esmo_executor, poll_esmo_once)
         except Exception as e:
             logger.error("ESMO Polling loop exception: %s", e)
-        
-        await asyncio.sleep(interval)
+
+        # Back off while the portal has nothing new; snap back as soon as rows arrive.
+        idle_cycles = 0 if changed else idle_cycles + 1
+        delay = min(interval * (2 ** min(idle_cycles, 4)), interval * _MAX_IDLE_BACKOFF_FACTOR)
+        await asyncio.sleep(delay + random.uniform(0, 0.1 * delay))
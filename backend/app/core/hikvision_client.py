@@ -7,16 +7,29 @@ It NEVER writes, modifies, or deletes any data on the turnstile devices.
 
 from __future__ import annotations
 
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
+import orjson
 import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
 
 logger = logging.getLogger("hikvision")
 
+# Requested AcsEvent page size; firmware caps it (often at 30) and we follow what it returns.
+_EVENT_PAGE_SIZE = 200
+# Concurrent AcsEvent page searches per device once totalMatches is known.
+_EVENT_PAGE_WORKERS = 4
+# ISAPI elements live in this namespace; stripping it is a slice, not a QName per child.
+_HIK_NS_PREFIX = "{http://www.hikvision.com/ver20/XMLSchema}"
+_HIK_NS_PREFIX_LEN = len(_HIK_NS_PREFIX)
+# Shared parser for ISAPI XML bodies; devices never need entities or network access.
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
 
 class HikvisionClient:
     """Read-only ISAPI client for a single Hikvision device."""
@@ -29,15 +42,25 @@ class HikvisionClient:
         self.session = requests.Session()
         # Local device IPs must not use global system proxy.
         self.session.trust_env = False
+        # Session-level digest auth keeps the nonce between requests, so paginated
+        # searches reuse the keep-alive socket instead of re-challenging every page.
+        self.session.auth = self.auth
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1))
 
     def close(self) -> None:
         """Release HTTP session sockets."""
         self.session.close()
 
+    def __enter__(self) -> HikvisionClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def _get(self, path: str) -> requests.Response | None:
         """Send a READ-ONLY GET request. Never sends POST/PUT/DELETE."""
         try:
-            resp = self.session.get(f"{self.base_url}{path}", auth=self.auth, timeout=self.timeout)
+            resp = self.session.get(f"{self.base_url}{path}", timeout=self.timeout)
             resp.raise_for_status()
             return resp
         except requests.exceptions.RequestException as exc:
@@ -50,8 +73,7 @@ class HikvisionClient:
         try:
             resp = self.session.post(
                 f"{self.base_url}{path}",
-                json=body,
-                auth=self.auth,
+                data=orjson.dumps(body),
                 timeout=self.timeout,
                 headers={"Content-Type": "application/json"},
             )
@@ -68,12 +90,16 @@ class HikvisionClient:
             return None
         # Parse XML response
         try:
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(resp.text)
-            ns = {"hik": "http://www.hikvision.com/ver20/XMLSchema"}
+            root = etree.fromstring(resp.content, _XML_PARSER)
             info: dict[str, Any] = {}
             for child in root:
-                tag = child.tag.replace(f"{{{ns.get('hik', '')}}}", "").split("}")[-1]
+                tag = child.tag
+                if not isinstance(tag, str):
+                    continue  # comments / processing instructions
+                if tag.startswith(_HIK_NS_PREFIX):
+                    tag = tag[_HIK_NS_PREFIX_LEN:]
+                elif tag[:1] == "{":
+                    tag = tag.rpartition("}")[2]
                 info[tag] = child.text
             return info
         except Exception as exc:
@@ -87,7 +113,7 @@ class HikvisionClient:
         info = self.get_device_info()
         return info is not None
 
-    def fetch_access_events(self, start_time: str, end_time: str) -> list[dict]:
+    def fetch_access_events(self, start_time: str, end_time: str) -> Iterator[dict]:
         """
         Fetch access control events (read-only search).
 
@@ -99,57 +125,76 @@ class HikvisionClient:
             start_time: ISO format "2026-02-13T00:00:00+05:00"
             end_time: ISO format "2026-02-13T23:59:59+05:00"
 
-        Returns:
-            List of event dicts with keys like: employeeNoString, time, eventType, etc.
+        Yields:
+            Event dicts with keys like: employeeNoString, time, eventType, etc.,
+            page by page, so callers never hold the whole window as raw pages.
         """
-        all_events: list[dict] = []
-        search_position = 0
-        max_results = 30  # Per-page
-
-        while True:
-            body = {
-                "AcsEventCond": {
-                    "searchID": "minetrack_readonly_search",
-                    "searchResultPosition": search_position,
-                    "maxResults": max_results,
-                    "major": 0,
-                    "minor": 0,
-                    "startTime": start_time,
-                    "endTime": end_time,
-                }
+        first_page, total_matches = self._search_access_events(start_time, end_time, 0)
+        first_page = first_page or []
+        fetched = len(first_page)
+        yield from first_page
+
+        # Devices clamp maxResults to their own limit, so step by the page size they
+        # actually returned; the remaining positions are known and fetched concurrently.
+        page_size = len(first_page)
+        del first_page
+        if page_size and total_matches > page_size:
+            positions = range(page_size, total_matches, page_size)
+            with ThreadPoolExecutor(max_workers=min(_EVENT_PAGE_WORKERS, len(positions))) as pool:
+                pages = pool.map(lambda pos: self._search_access_events(start_time, end_time, pos), positions)
+                for position, (page, _) in zip(positions, pages):
+                    if page is None:
+                        # Retry once; if the page is still missing, stop here like a sequential
+                        # search would. Later pages must not be yielded, or the poller's cursor
+                        # would move past events that were never fetched.
+                        page, _ = self._search_access_events(start_time, end_time, position)
+                        if page is None:
+                            logger.warning(
+                                "Event page at position %d failed on %s; stopping search", position, self.name
+                            )
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            break
+                    fetched += len(page)
+                    yield from page
+
+        if fetched < total_matches:
+            logger.warning("Fetched %d of %d events from %s", fetched, total_matches, self.name)
+        logger.info("Fetched %d events from %s", fetched, self.name)
+
+    def _search_access_events(
+        self, start_time: str, end_time: str, position: int
+    ) -> tuple[list[dict] | None, int]:
+        """Run one AcsEvent search page; returns (events, totalMatches), events=None on failure."""
+        body = {
+            "AcsEventCond": {
+                "searchID": "minetrack_readonly_search",
+                "searchResultPosition": position,
+                "maxResults": _EVENT_PAGE_SIZE,
+                "major": 0,
+                "minor": 0,
+                "startTime": start_time,
+                "endTime": end_time,
             }
+        }
 
-            resp = self._post_search(
-                "/ISAPI/AccessControl/AcsEvent?format=json",
-                body,
-            )
-
-            if resp is None:
-                break
+        resp = self._post_search(
+            "/ISAPI/AccessControl/AcsEvent?format=json",
+            body,
+        )
 
-            try:
-                data = resp.json()
-            except (json.JSONDecodeError, ValueError):
-                logger.warning("Invalid JSON from AcsEvent search")
-                break
-            finally:
-                resp.close()
-
-            acs_event = data.get("AcsEvent", {})
-            total_matches = acs_event.get("totalMatches", 0)
-            info_list = acs_event.get("InfoList", [])
-
-            if not info_list:
-                break
-
-            all_events.extend(info_list)
-            search_position += len(info_list)
+        if resp is None:
+            return None, 0
 
-            if search_position >= total_matches:
-                break
+        try:
+            data = orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            logger.warning("Invalid JSON from AcsEvent search")
+            return None, 0
+        finally:
+            resp.close()
 
-        logger.info("Fetched %d events from %s", len(all_events), self.name)
-        return all_events
+        acs_event = data.get("AcsEvent", {})
+        return acs_event.get("InfoList", []) or [], int(acs_event.get("totalMatches", 0) or 0)
 
     def fetch_all_users(self) -> list[dict]:
         """
@@ -178,8 +223,8 @@ class HikvisionClient:
                 break
 
             try:
-                data = resp.json()
-            except (json.JSONDecodeError, ValueError):
+                data = orjson.loads(resp.content)
+            except orjson.JSONDecodeError:
                 logger.warning("Invalid JSON from UserInfo search")
                 break
             finally:
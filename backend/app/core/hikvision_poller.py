@@ -18,10 +18,19 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import re
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
 
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -30,17 +39,20 @@ from app.core.hikvision_identity import (
     HIKVISION_MINE_SYSTEM,
     HIKVISION_SYSTEM,
     MINE_HOSTS,
+    external_id_candidates,
     external_system_for_host,
     find_employee_by_external_id,
 )
 from app.db.session import SessionLocal
 from app.models.device import Device, DeviceType
 from app.models.employee import Employee
+from app.models.employee_external_id import EmployeeExternalID
 from app.models.event import Event, EventStatus, EventType
 
 logger = logging.getLogger("hikvision.poller")
 
-DEVICE_IP_MAP = {
+# Read-only: directions are fixed per IP for the lifetime of the process.
+DEVICE_IP_MAP: Mapping[str, EventType] = MappingProxyType({
     "192.168.0.223": EventType.TURNSTILE_IN,
     "192.168.0.221": EventType.TURNSTILE_IN,
     "192.168.0.219": EventType.TURNSTILE_IN,
@@ -49,13 +61,49 @@ DEVICE_IP_MAP = {
     "192.168.0.224": EventType.TURNSTILE_OUT,
     "192.168.0.222": EventType.TURNSTILE_OUT,
     "192.168.0.220": EventType.TURNSTILE_OUT,
-}
+})
+_RE_NAME_IN = re.compile(r"kirish|entry", re.IGNORECASE)
+_RE_NAME_OUT = re.compile(r"chiqish|exit", re.IGNORECASE)
+# (host, device_name) -> direction implied by the IP map or device name; None when neither decides.
+_NAME_DIRECTION_CACHE: dict[tuple[str, str], EventType | None] = {}
 
 DEDUP_SECONDS = max(settings.TURNSTILE_DEDUP_SECONDS, 1)
 LOCAL_TZ = timezone(timedelta(hours=5))
 INITIAL_LOOKBACK_HOURS = max(settings.HIKVISION_INITIAL_LOOKBACK_HOURS, 1)
 RECOVERY_OVERLAP_SECONDS = max(settings.HIKVISION_RECOVERY_OVERLAP_SECONDS, 0)
 LAST_CURSOR_UTC: dict[str, datetime] = {}
+# Upper bound for bound parameters in a single IN (...) prefetch query.
+_IN_CLAUSE_CHUNK = 1000
+# Event rows per multi-row INSERT statement.
+_INSERT_BATCH_SIZE = 500
+_CLIENT_CACHE: dict[tuple[str, int], HikvisionClient] = {}
+# Blocking ISAPI and DB work runs on its own pool, sized to the device concurrency cap,
+# so N devices never occupy (or queue behind) the loop's shared default executor.
+_hikvision_executor = ThreadPoolExecutor(
+    max_workers=max(settings.HIKVISION_MAX_CONCURRENCY, 1),
+    thread_name_prefix="hikvision-poll",
+)
+# Overlapping poll windows re-read the same serials; remember stored ones for a while.
+_SEEN_RAW_ID_TTL_SECONDS = 900
+_SEEN_RAW_IDS: dict[int, dict[str, float]] = {}
+# ISAPI event keys kept in source_payload; face-capture metadata and the like are dropped.
+_PAYLOAD_KEYS = frozenset({
+    "serialNo",
+    "time",
+    "employeeNoString",
+    "cardNo",
+    "doorNo",
+    "minor",
+    "major",
+    "eventType",
+    "currentVerifyMode",
+    "name",
+    "ipAddress",
+    "deviceIP",
+    "devIp",
+})
+# device_code -> devices.id, so later cycles touch last_seen with a single UPDATE.
+_DEVICE_ID_CACHE: dict[str, int] = {}
 
 
 def _normalize_name(value: str | None) -> str:
@@ -126,18 +174,22 @@ def _find_employee_by_name(db: Session, payload_name: str) -> Employee | None:
     return None
 
 
-def _parse_devices() -> list[dict]:
-    """Parse HIKVISION_DEVICES from settings (JSON string)."""
+@lru_cache(maxsize=1)
+def _parse_devices() -> tuple[dict, ...]:
+    """Parse HIKVISION_DEVICES from settings (JSON string).
+
+    Parsed once per process: settings are read at import, so config changes need a restart anyway.
+    """
     try:
         devices = json.loads(settings.HIKVISION_DEVICES)
         if isinstance(devices, list) and devices:
-            filtered = [d for d in devices if isinstance(d, dict) and d.get("host")]
+            filtered = tuple(d for d in devices if isinstance(d, dict) and d.get("host"))
             if filtered:
                 return filtered
     except (json.JSONDecodeError, TypeError):
         pass
     # Fallback to hardcoded map so polling can still recover data after downtime.
-    return [{"host": ip, "name": ip, "port": 80} for ip in DEVICE_IP_MAP]
+    return tuple({"host": ip, "name": ip, "port": 80} for ip in DEVICE_IP_MAP)
 
 
 def _ensure_aware_utc(dt: datetime) -> datetime:
@@ -178,19 +230,41 @@ def _compute_poll_window(db: Session, device_id: int, host: str) -> tuple[str, s
     return start_time, end_time
 
 
-def _get_or_create_device(db: Session, device_info: dict) -> Device | None:
+class _DeviceRef(NamedTuple):
+    """The Device columns a poll cycle needs."""
+
+    id: int
+    name: str
+    is_active: bool
+
+
+def _get_or_create_device(db: Session, device_info: dict) -> _DeviceRef | None:
     """Find or create a device record in MineTrack DB (not on the turnstile!)."""
     host = device_info.get("host", "")
     name = device_info.get("name", host)
     device_code = f"HIK_{host.replace('.', '_')}"
     now = datetime.now(timezone.utc)
 
+    device_id = _DEVICE_ID_CACHE.get(device_code)
+    if device_id is not None:
+        row = db.execute(
+            update(Device)
+            .where(Device.id == device_id)
+            .values(last_seen=now)
+            .returning(Device.id, Device.name, Device.is_active)
+        ).first()
+        if row:
+            return _DeviceRef(*row)
+        # Row was deleted meanwhile; fall back to the full lookup.
+        del _DEVICE_ID_CACHE[device_code]
+
     device = db.query(Device).filter(Device.device_code == device_code).first()
     if device:
         device.last_seen = now
         if host and not device.host:
             device.host = host
-        return device
+        _DEVICE_ID_CACHE[device_code] = device.id
+        return _DeviceRef(device.id, device.name, device.is_active)
 
     # Create new device in MineTrack DB
     device = Device(
@@ -211,7 +285,50 @@ def _get_or_create_device(db: Session, device_info: dict) -> Device | None:
     except IntegrityError:
         db.rollback()
         device = db.query(Device).filter(Device.device_code == device_code).first()
-    return device
+    if not device:
+        return None
+    _DEVICE_ID_CACHE[device_code] = device.id
+    return _DeviceRef(device.id, device.name, device.is_active)
+
+
+@dataclass(slots=True)
+class _EmployeeLookup:
+    """Employees for one device poll, prefetched by external id and by employee_no."""
+
+    by_external_id: dict[str, Employee] = field(default_factory=dict)
+    by_employee_no: dict[str, Employee] = field(default_factory=dict)
+
+    def external(self, employee_no: str) -> Employee | None:
+        # Same candidate order as find_employee_by_external_id: raw id, then zero-stripped.
+        for candidate in external_id_candidates(employee_no):
+            employee = self.by_external_id.get(candidate)
+            if employee:
+                return employee
+        return None
+
+
+def _load_employee_lookup(db: Session, host: str, employee_nos: set[str]) -> _EmployeeLookup:
+    lookup = _EmployeeLookup()
+    system = external_system_for_host(host)
+    candidates = list({candidate for employee_no in employee_nos for candidate in external_id_candidates(employee_no)})
+    for start in range(0, len(candidates), _IN_CLAUSE_CHUNK):
+        chunk = candidates[start:start + _IN_CLAUSE_CHUNK]
+        rows = (
+            db.query(EmployeeExternalID.external_id, Employee)
+            .join(Employee, Employee.id == EmployeeExternalID.employee_id)
+            .filter(EmployeeExternalID.system == system, EmployeeExternalID.external_id.in_(chunk))
+        )
+        for external_id, employee in rows:
+            lookup.by_external_id[str(external_id)] = employee
+
+    # Mine turnstiles never fall back to employee_no (separate ID domain).
+    if host not in MINE_HOSTS:
+        numbers = list(employee_nos)
+        for start in range(0, len(numbers), _IN_CLAUSE_CHUNK):
+            chunk = numbers[start:start + _IN_CLAUSE_CHUNK]
+            for employee in db.query(Employee).filter(Employee.employee_no.in_(chunk)):
+                lookup.by_employee_no.setdefault(employee.employee_no, employee)
+    return lookup
 
 
 def _find_employee_by_hikvision_id(
@@ -219,17 +336,22 @@ def _find_employee_by_hikvision_id(
     employee_no: str,
     payload_name: str,
     host: str,
+    lookup: _EmployeeLookup | None = None,
 ) -> Employee | None:
     """Find employee by Hikvision card/employee number.
 
     First tries EmployeeExternalID (system='HIKVISION'),
     then falls back to employee_no match only when name validation passes.
     Mine devices use name-based mapping to avoid ID-domain collisions.
+    A prefetched ``lookup`` replaces the ID queries with dict hits.
     """
     # Mine turnstiles have their own ID domain.
     # They must use explicit EmployeeExternalID mapping, never name-based runtime matching.
     if host in MINE_HOSTS:
-        employee = find_employee_by_external_id(db, HIKVISION_MINE_SYSTEM, employee_no)
+        if lookup is not None:
+            employee = lookup.external(employee_no)
+        else:
+            employee = find_employee_by_external_id(db, HIKVISION_MINE_SYSTEM, employee_no)
         if not employee:
             logger.warning(
                 "[%s] Mine EmployeeExternalID mapping missing: employee_no=%s payload_name=%s system=%s",
@@ -253,7 +375,10 @@ def _find_employee_by_hikvision_id(
 
     # Non-mine: external ID lookup first.
     system = external_system_for_host(host) or HIKVISION_SYSTEM
-    employee = find_employee_by_external_id(db, system, employee_no)
+    if lookup is not None:
+        employee = lookup.external(employee_no)
+    else:
+        employee = find_employee_by_external_id(db, system, employee_no)
     if employee and str(employee.employee_no or "").upper().startswith("MINE-"):
         logger.warning(
             "[%s] Cross-domain mapping blocked: employee_no=%s mapped_internal=%s",
@@ -276,7 +401,10 @@ def _find_employee_by_hikvision_id(
         return employee
 
     # Fallback: direct employee_no match
-    employee = db.query(Employee).filter(Employee.employee_no == employee_no).first()
+    if lookup is not None:
+        employee = lookup.by_employee_no.get(employee_no)
+    else:
+        employee = db.query(Employee).filter(Employee.employee_no == employee_no).first()
     if not employee:
         return None
     if str(employee.employee_no or "").upper().startswith("MINE-"):
@@ -304,16 +432,27 @@ def _find_employee_by_hikvision_id(
     return employee
 
 
-def _determine_event_type(event_data: dict, host: str, device_name: str) -> EventType:
-    """Determine TURNSTILE_IN or TURNSTILE_OUT from Hikvision event data."""
+def _direction_from_device(host: str, device_name: str) -> EventType | None:
+    """Direction fixed by the device itself (IP map, then name keywords), if any."""
     if host in DEVICE_IP_MAP:
         return DEVICE_IP_MAP[host]
-
-    name_l = (device_name or "").lower()
-    if "kirish" in name_l or "entry" in name_l:
+    name = device_name or ""
+    if _RE_NAME_IN.search(name):
         return EventType.TURNSTILE_IN
-    if "chiqish" in name_l or "exit" in name_l:
+    if _RE_NAME_OUT.search(name):
         return EventType.TURNSTILE_OUT
+    return None
+
+
+def _determine_event_type(event_data: dict, host: str, device_name: str) -> EventType:
+    """Determine TURNSTILE_IN or TURNSTILE_OUT from Hikvision event data."""
+    key = (host, device_name)
+    try:
+        by_name = _NAME_DIRECTION_CACHE[key]
+    except KeyError:
+        by_name = _NAME_DIRECTION_CACHE[key] = _direction_from_device(host, device_name)
+    if by_name is not None:
+        return by_name
 
     # Hikvision major=5 (Access Control), minor types:
     # 75 = Face Authentication Passed (IN)
@@ -341,200 +480,429 @@ def _parse_hikvision_time(time_str: str) -> datetime:
     """Parse Hikvision time format to timezone-aware datetime."""
     # Format: "2026-02-13T08:30:00+05:00" or "2026-02-13T08:30:00"
     try:
-        if "+" in time_str or time_str.endswith("Z"):
-            return datetime.fromisoformat(time_str)
-        return datetime.fromisoformat(time_str).replace(tzinfo=timezone(timedelta(hours=5)))
+        parsed = datetime.fromisoformat(time_str)
     except (ValueError, TypeError):
         return datetime.now(timezone.utc)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=LOCAL_TZ)
 
 
-def poll_single_device(device_info: dict) -> int:
-    """Poll a single Hikvision device for new events. Returns count of new events saved."""
-    host = device_info.get("host", "")
-    port = device_info.get("port", 80)
-    name = device_info.get("name", host)
+def _event_raw_id(evt_data: dict, event_time_raw: str, host: str) -> str:
+    """Device serial number, or a synthetic id when the payload has none."""
+    raw_id = str(evt_data.get("serialNo", "")).strip()
+    if raw_id:
+        return raw_id
+    employee_no = str(evt_data.get("employeeNoString", evt_data.get("cardNo", "")))
+    if not employee_no:
+        return ""
+    return f"{employee_no}:{event_time_raw}:{host}"
+
+
+@dataclass(slots=True)
+class _RecentEvents:
+    """In-memory view of one device's events around a poll batch, used for dedup."""
+
+    raw_ids: set[str] = field(default_factory=set)
+    # (event_type, normalized payload name) -> sorted event timestamps, any status.
+    by_name: dict[tuple[EventType, str], list[datetime]] = field(default_factory=dict)
+    # (employee_id, event_type) -> sorted timestamps of ACCEPTED events.
+    by_employee: dict[tuple[int, EventType], list[datetime]] = field(default_factory=dict)
+
+    def has_name_near(self, event_type: EventType, normalized_name: str, ts: datetime) -> bool:
+        return _has_ts_near(self.by_name.get((event_type, normalized_name)), ts)
+
+    def has_employee_near(self, employee_id: int, event_type: EventType, ts: datetime) -> bool:
+        return _has_ts_near(self.by_employee.get((employee_id, event_type)), ts)
+
+    def add(
+        self,
+        raw_id: str,
+        employee_id: int,
+        event_type: EventType,
+        ts: datetime,
+        normalized_name: str,
+    ) -> None:
+        """Record an event accepted during this cycle."""
+        self.raw_ids.add(raw_id)
+        if normalized_name:
+            insort(self.by_name.setdefault((event_type, normalized_name), []), ts)
+        insort(self.by_employee.setdefault((employee_id, event_type), []), ts)
+
+
+def _has_ts_near(timestamps: list[datetime] | None, ts: datetime) -> bool:
+    if not timestamps:
+        return False
+    window = timedelta(seconds=DEDUP_SECONDS)
+    idx = bisect_left(timestamps, ts - window)
+    return idx < len(timestamps) and timestamps[idx] <= ts + window
+
 
-    if not host:
-        return 0
+def _load_recent_events(
+    db: Session,
+    device_id: int,
+    raw_ids: set[str],
+    first_ts: datetime,
+    last_ts: datetime,
+) -> _RecentEvents:
+    recent = _RecentEvents()
+    raw_id_list = list(raw_ids)
+    for start in range(0, len(raw_id_list), _IN_CLAUSE_CHUNK):
+        chunk = raw_id_list[start:start + _IN_CLAUSE_CHUNK]
+        recent.raw_ids.update(
+            raw_id
+            for (raw_id,) in db.query(Event.raw_id).filter(Event.device_id == device_id, Event.raw_id.in_(chunk))
+        )
 
-    client = HikvisionClient(
-        host=host,
-        port=port,
-        user=settings.HIKVISION_USER,
-        password=settings.HIKVISION_PASS,
+    window = timedelta(seconds=DEDUP_SECONDS)
+    rows = (
+        db.query(Event.employee_id, Event.event_type, Event.event_ts, Event.status, Event.source_payload["name"].astext)
+        .filter(
+            Event.device_id == device_id,
+            Event.event_ts >= first_ts - window,
+            Event.event_ts <= last_ts + window,
+        )
+        .order_by(Event.event_ts)
     )
+    for employee_id, event_type, event_ts, status, payload_name in rows:
+        event_ts = _ensure_aware_utc(event_ts)
+        normalized_name = _normalize_name(payload_name)
+        if normalized_name:
+            recent.by_name.setdefault((event_type, normalized_name), []).append(event_ts)
+        if status == EventStatus.ACCEPTED:
+            recent.by_employee.setdefault((employee_id, event_type), []).append(event_ts)
+    return recent
 
-    db: Session = SessionLocal()
-    saved_count = 0
-    try:
-        device = _get_or_create_device(db, device_info)
-        if not device:
-            logger.error("Could not find/create device for %s", name)
-            return 0
-        if not device.is_active:
-            logger.info("[%s] Device is disabled, skip polling", name)
-            db.commit()
-            return 0
 
-        start_time, end_time = _compute_poll_window(db, device.id, host)
-        events = client.fetch_access_events(start_time, end_time)
-        if not events:
-            db.commit()
-            return 0
-
-        max_seen_ts: datetime | None = None
-        for evt_data in events:
-            event_time_raw = str(evt_data.get("time", ""))
-            parsed_ts = _parse_hikvision_time(event_time_raw)
-            if max_seen_ts is None or parsed_ts > max_seen_ts:
-                max_seen_ts = parsed_ts
-
-            # Check duplicate (by device_id + raw_id)
-            # Find employee
-            employee_no = str(evt_data.get("employeeNoString", evt_data.get("cardNo", "")))
-            if not employee_no:
-                continue
+def _recently_seen_raw_ids(device_id: int) -> dict[str, float]:
+    """Raw ids known to be stored for a device, mapped to their expiry; expired ids are dropped.
+
+    Each device is polled by one task at a time, so its dict is never shared between threads.
+    """
+    seen = _SEEN_RAW_IDS.setdefault(device_id, {})
+    now = time.monotonic()
+    expired = [raw_id for raw_id, expires_at in seen.items() if expires_at <= now]
+    for raw_id in expired:
+        del seen[raw_id]
+    return seen
+
+
+def _insert_new_events(db: Session, rows: list[dict]) -> dict[int, int]:
+    """INSERT ... ON CONFLICT DO NOTHING in batches; returns written row counts per device_id."""
+    inserted: dict[int, int] = {}
+    for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+        stmt = (
+            pg_insert(Event.__table__)
+            .values(rows[start:start + _INSERT_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["device_id", "raw_id"])
+            .returning(Event.__table__.c.device_id)
+        )
+        for (device_id,) in db.execute(stmt):
+            inserted[device_id] = inserted.get(device_id, 0) + 1
+    return inserted
 
-            raw_id = str(evt_data.get("serialNo", "")).strip()
-            if not raw_id:
-                raw_id = f"{employee_no}:{event_time_raw}:{host}"
-            if not raw_id:
-                continue
 
-            existing = (
-                db.query(Event)
-                .filter(Event.device_id == device.id, Event.raw_id == raw_id)
-                .first()
+def _write_events_batch(db: Session, rows: list[dict]) -> dict[int, int]:
+    """Insert the cycle's rows; on a rejected batch retry row by row so one bad row only drops itself."""
+    try:
+        with db.begin_nested():
+            return _insert_new_events(db, rows)
+    except DBAPIError as exc:
+        logger.warning("Hikvision event batch insert failed, retrying row by row: %s", exc.orig)
+
+    inserted: dict[int, int] = {}
+    for row in rows:
+        try:
+            with db.begin_nested():
+                written = _insert_new_events(db, [row])
+        except DBAPIError as exc:
+            logger.warning(
+                "Hikvision event rejected (device_id=%s raw_id=%s), row skipped: %s",
+                row["device_id"],
+                row["raw_id"],
+                exc.orig,
             )
-            if existing:
-                continue
+            continue
+        for device_id, count in written.items():
+            inserted[device_id] = inserted.get(device_id, 0) + count
+    return inserted
+
+
+def _get_client(host: str, port: int) -> HikvisionClient:
+    """Per-device client kept across cycles so keep-alive sockets and the digest nonce survive."""
+    key = (host, port)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client = _CLIENT_CACHE.setdefault(
+            key,
+            HikvisionClient(
+                host=host,
+                port=port,
+                user=settings.HIKVISION_USER,
+                password=settings.HIKVISION_PASS,
+            ),
+        )
+    return client
 
-            payload_host = str(
-                evt_data.get("ipAddress")
-                or evt_data.get("deviceIP")
-                or evt_data.get("devIp")
-                or ""
-            ).strip()
-            if payload_host and payload_host != host:
-                logger.warning(
-                    "[%s] Skipping event with mismatched payload host=%s serial=%s employee_no=%s",
-                    host,
-                    payload_host,
-                    raw_id,
-                    employee_no,
-                )
-                continue
 
-            evt_payload = dict(evt_data)
-            evt_payload.setdefault("source_host", host)
-            evt_payload.setdefault("source_device_name", name)
+@dataclass(slots=True)
+class _DevicePoll:
+    """One device's share of a poll cycle: its DB row, search window and parsed events."""
 
-            event_ts = parsed_ts
-            event_type = _determine_event_type(evt_payload, host, device.name if device else name)
-            payload_name = str(evt_payload.get("name", ""))
-            normalized_payload_name = _normalize_name(payload_name)
-
-            # Secondary dedup: some devices emit duplicated passages with different employeeNo/serialNo.
-            # If the same name appears on the same device/type in the dedup window, keep only one record.
-            if normalized_payload_name:
-                nearby = (
-                    db.query(Event)
-                    .filter(
-                        Event.device_id == device.id,
-                        Event.event_type == event_type,
-                        Event.event_ts >= event_ts - timedelta(seconds=DEDUP_SECONDS),
-                        Event.event_ts <= event_ts + timedelta(seconds=DEDUP_SECONDS),
-                    )
-                    .all()
-                )
-                if any(
-                    _normalize_name((evt.source_payload or {}).get("name", "")) == normalized_payload_name
-                    for evt in nearby
-                ):
-                    continue
+    host: str
+    port: int
+    name: str
+    device: _DeviceRef
+    start_time: str
+    end_time: str
+    events: list[tuple[dict, str, datetime]] = field(default_factory=list)
 
-            employee = _find_employee_by_hikvision_id(db, employee_no, payload_name, host)
-            if not employee:
-                logger.debug("Employee not found for Hikvision ID: %s", employee_no)
-                continue
 
-            # Debounce repeated reads from the same passage.
-            dup = (
-                db.query(Event)
-                .filter(
-                    Event.device_id == device.id,
-                    Event.employee_id == employee.id,
-                    Event.event_type == event_type,
-                    Event.status == EventStatus.ACCEPTED,
-                    Event.event_ts >= event_ts - timedelta(seconds=DEDUP_SECONDS),
-                    Event.event_ts <= event_ts + timedelta(seconds=DEDUP_SECONDS),
-                )
-                .first()
-            )
-            if dup:
+def _prepare_polls(devices: tuple[dict, ...]) -> tuple[list[_DevicePoll], dict[str, int]]:
+    """Resolve device rows and search windows in one session.
+
+    Returns the active devices to fetch and the results already decided for the rest.
+    """
+    polls: list[_DevicePoll] = []
+    results: dict[str, int] = {}
+    db: Session = SessionLocal()
+    try:
+        for device_info in devices:
+            host = device_info.get("host", "")
+            name = device_info.get("name", host)
+            if not host:
+                continue
+            try:
+                device = _get_or_create_device(db, device_info)
+                if not device:
+                    logger.error("Could not find/create device for %s", name)
+                    results[name] = 0
+                    continue
+                if not device.is_active:
+                    logger.info("[%s] Device is disabled, skip polling", name)
+                    results[name] = 0
+                    continue
+                start_time, end_time = _compute_poll_window(db, device.id, host)
+            except Exception as exc:
+                logger.error("[%s] Polling error: %s", name, exc)
+                db.rollback()
+                results[name] = -1
                 continue
+            polls.append(_DevicePoll(host, device_info.get("port", 80), name, device, start_time, end_time))
+        db.commit()
+    finally:
+        db.close()
+    return polls, results
+
 
-            # Create event in MineTrack DB
-            event = Event(
-                device_id=device.id,
-                employee_id=employee.id,
-                event_type=event_type,
-                event_ts=event_ts,
-                raw_id=raw_id,
-                status=EventStatus.ACCEPTED,
-                source_payload=evt_payload,
+def _fetch_events(poll: _DevicePoll) -> list[tuple[dict, str, datetime]]:
+    """HTTP leg of a poll: read events in the device's window, touching no DB state.
+
+    Events are parsed as they stream in, so only the (event, raw time, parsed ts)
+    list is kept rather than a raw list plus a parsed copy.
+    """
+    client = _get_client(poll.host, poll.port)
+    parsed_events: list[tuple[dict, str, datetime]] = []
+    for evt_data in client.fetch_access_events(poll.start_time, poll.end_time):
+        event_time_raw = str(evt_data.get("time", ""))
+        parsed_events.append((evt_data, event_time_raw, _parse_hikvision_time(event_time_raw)))
+    return parsed_events
+
+
+def _build_event_rows(db: Session, poll: _DevicePoll) -> tuple[list[dict], _RecentEvents, datetime]:
+    """Deduplicate one device's fetched events; returns (new rows, recent index, newest event ts)."""
+    host, name, device = poll.host, poll.name, poll.device
+
+    parsed_events = poll.events
+    candidate_raw_ids: set[str] = set()
+    employee_nos: set[str] = set()
+    for evt_data, event_time_raw, _ in parsed_events:
+        candidate_raw_ids.add(_event_raw_id(evt_data, event_time_raw, host))
+        employee_nos.add(str(evt_data.get("employeeNoString", evt_data.get("cardNo", ""))))
+    candidate_raw_ids.discard("")
+    # Raw ids stored in a recent cycle need no DB round-trip at all.
+    seen_raw_ids = _recently_seen_raw_ids(device.id)
+    candidate_raw_ids.difference_update(seen_raw_ids)
+    employee_nos.discard("")
+    min_seen_ts = min(parsed_ts for _, _, parsed_ts in parsed_events)
+    max_seen_ts = max(parsed_ts for _, _, parsed_ts in parsed_events)
+
+    # Existing raw ids and the events around this batch are loaded once; the loop
+    # below deduplicates against them in memory instead of querying per event.
+    recent = _load_recent_events(db, device.id, candidate_raw_ids, min_seen_ts, max_seen_ts)
+    employees = _load_employee_lookup(db, host, employee_nos)
+
+    # Mapped IPs fix the direction for every event, so classification is skipped entirely.
+    fast_type = DEVICE_IP_MAP.get(host)
+
+    new_rows: list[dict] = []
+    for evt_data, event_time_raw, parsed_ts in parsed_events:
+        # Check duplicate (by device_id + raw_id)
+        # Find employee
+        employee_no = str(evt_data.get("employeeNoString", evt_data.get("cardNo", "")))
+        if not employee_no:
+            continue
+
+        # Never empty here: without a serialNo it falls back to employee_no:time:host.
+        raw_id = _event_raw_id(evt_data, event_time_raw, host)
+        if raw_id in seen_raw_ids or raw_id in recent.raw_ids:
+            continue
+
+        payload_host = str(
+            evt_data.get("ipAddress")
+            or evt_data.get("deviceIP")
+            or evt_data.get("devIp")
+            or ""
+        ).strip()
+        if payload_host and payload_host != host:
+            logger.warning(
+                "[%s] Skipping event with mismatched payload host=%s serial=%s employee_no=%s",
+                host,
+                payload_host,
+                raw_id,
+                employee_no,
             )
-            db.add(event)
+            continue
+
+        if settings.HIKVISION_STORE_FULL_PAYLOAD:
+            evt_payload = dict(evt_data)
+        else:
+            evt_payload = {key: evt_data[key] for key in _PAYLOAD_KEYS if key in evt_data}
+        evt_payload.setdefault("source_host", host)
+        evt_payload.setdefault("source_device_name", name)
+
+        event_ts = parsed_ts
+        if fast_type is not None:
+            event_type = fast_type
+        else:
+            event_type = _determine_event_type(evt_payload, host, device.name if device else name)
+        payload_name = str(evt_payload.get("name", ""))
+        normalized_payload_name = _normalize_name(payload_name)
+
+        # Secondary dedup: some devices emit duplicated passages with different employeeNo/serialNo.
+        # If the same name appears on the same device/type in the dedup window, keep only one record.
+        if normalized_payload_name and recent.has_name_near(event_type, normalized_payload_name, event_ts):
+            continue
 
+        employee = _find_employee_by_hikvision_id(db, employee_no, payload_name, host, employees)
+        if not employee:
+            logger.debug("Employee not found for Hikvision ID: %s", employee_no)
+            continue
+
+        # Debounce repeated reads from the same passage.
+        if recent.has_employee_near(employee.id, event_type, event_ts):
+            continue
+
+        # Queue the event; same-batch duplicates are caught by the in-memory index.
+        new_rows.append(
+            {
+                "device_id": device.id,
+                "employee_id": employee.id,
+                "event_type": event_type,
+                "event_ts": event_ts,
+                "received_ts": datetime.now(timezone.utc),
+                "raw_id": raw_id,
+                "status": EventStatus.ACCEPTED,
+                "source_payload": evt_payload,
+            }
+        )
+        recent.add(raw_id, employee.id, event_type, event_ts, normalized_payload_name)
+
+    return new_rows, recent, max_seen_ts
+
+
+def _persist_events_batch(polls: list[_DevicePoll]) -> dict[str, int]:
+    """DB leg of a poll cycle: dedup every device's events, then insert and commit once."""
+    results: dict[str, int] = {}
+    built: list[tuple[_DevicePoll, _RecentEvents, datetime]] = []
+    all_rows: list[dict] = []
+
+    db: Session = SessionLocal()
+    try:
+        for poll in polls:
+            if not poll.events:
+                results[poll.name] = 0
+                continue
             try:
-                db.commit()
-                saved_count += 1
-            except IntegrityError:
-                db.rollback()  # Duplicate — skip silently
+                rows, recent, max_seen_ts = _build_event_rows(db, poll)
+            except Exception as exc:
+                logger.error("[%s] Polling error: %s", poll.name, exc)
+                # Nothing was written yet; the rows queued for other devices stay valid.
+                db.rollback()
+                results[poll.name] = -1
+                continue
+            built.append((poll, recent, max_seen_ts))
+            all_rows.extend(rows)
 
-        if max_seen_ts is not None:
-            LAST_CURSOR_UTC[host] = _ensure_aware_utc(max_seen_ts)
+        try:
+            # Rows another writer inserted meanwhile are skipped by uq_events_device_raw_id;
+            # rows Postgres rejects are skipped one by one without failing the other devices.
+            saved_by_device = _write_events_batch(db, all_rows)
+            db.commit()
+        except Exception as exc:
+            logger.error("Hikvision event batch insert failed: %s", exc)
+            db.rollback()
+            for poll, _, _ in built:
+                results[poll.name] = -1
+            return results
+    finally:
+        db.close()
 
+    expires_at = time.monotonic() + _SEEN_RAW_ID_TTL_SECONDS
+    for poll, recent, max_seen_ts in built:
+        _recently_seen_raw_ids(poll.device.id).update(dict.fromkeys(recent.raw_ids, expires_at))
+        LAST_CURSOR_UTC[poll.host] = _ensure_aware_utc(max_seen_ts)
+        saved_count = saved_by_device.get(poll.device.id, 0)
+        results[poll.name] = saved_count
         logger.info(
             "[%s] Saved %d new events (window: %s -> %s)",
-            name,
+            poll.name,
             saved_count,
-            start_time,
-            end_time,
+            poll.start_time,
+            poll.end_time,
         )
-    except Exception as exc:
-        logger.error("[%s] Polling error: %s", name, exc)
-        db.rollback()
-    finally:
-        db.close()
-        client.close()
+    return results
 
-    return saved_count
 
+async def poll_all_devices_async() -> dict[str, int]:
+    """Poll all configured Hikvision devices. Returns {device_name: saved_count}.
 
-def poll_all_devices() -> dict[str, int]:
-    """Poll all configured Hikvision devices. Returns {device_name: saved_count}."""
+    Device rows and windows are resolved in one session, the HTTP searches run
+    concurrently, and every device's new events are written in one transaction.
+    """
     devices = _parse_devices()
     if not devices:
         logger.debug("No Hikvision devices configured")
         return {}
 
-    results: dict[str, int] = {}
-    for dev in devices:
-        name = dev.get("name", dev.get("host", "unknown"))
-        try:
-            count = poll_single_device(dev)
-            results[name] = count
-        except Exception as exc:
-            logger.error("[%s] Unexpected error: %s", name, exc)
-            results[name] = -1
+    loop = asyncio.get_running_loop()
+    polls, results = await loop.run_in_executor(_hikvision_executor, _prepare_polls, devices)
 
+    # The executor's worker count caps concurrent device searches.
+    fetched = await asyncio.gather(
+        *(loop.run_in_executor(_hikvision_executor, _fetch_events, poll) for poll in polls),
+        return_exceptions=True,
+    )
+    ready: list[_DevicePoll] = []
+    for poll, events in zip(polls, fetched):
+        if isinstance(events, BaseException):
+            logger.error("[%s] Unexpected error: %s", poll.name, events)
+            results[poll.name] = -1
+            continue
+        poll.events = events
+        ready.append(poll)
+
+    results.update(await loop.run_in_executor(_hikvision_executor, _persist_events_batch, ready))
     return results
 
 
 async def hikvision_polling_loop():
-    """Background async loop that polls devices every N seconds."""
-    interval = max(settings.HIKVISION_POLL_INTERVAL, 10)  # Minimum 10 seconds
+    """Background async loop that polls devices, adapting the pause to recent activity.
+
+    The pause halves after a cycle that saved events and grows by half after an idle
+    cycle, staying within HIKVISION_POLL_INTERVAL_MIN..HIKVISION_POLL_INTERVAL_MAX.
+    """
+    min_interval = max(settings.HIKVISION_POLL_INTERVAL_MIN, 1)
+    max_interval = max(settings.HIKVISION_POLL_INTERVAL_MAX, min_interval)
+    interval = float(min(max(settings.HIKVISION_POLL_INTERVAL, min_interval), max_interval))
     devices = _parse_devices()
 
     if not devices:
@@ -542,16 +910,23 @@ async def hikvision_polling_loop():
         return
 
     logger.info(
-        "Hikvision polling started: %d devices, every %ds",
+        "Hikvision polling started: %d devices, every %d-%ds (initially %ds)",
         len(devices),
+        min_interval,
+        max_interval,
         interval,
     )
 
     while True:
         try:
-            # Run blocking I/O in thread pool (does not block event loop)
-            await asyncio.get_event_loop().run_in_executor(None, poll_all_devices)
+            # Blocking device I/O runs on the Hikvision worker pool (does not block event loop)
+            results = await poll_all_devices_async()
         except Exception as exc:
             logger.error("Hikvision polling cycle error: %s", exc)
+        else:
+            if any(count > 0 for count in results.values()):
+                interval = max(min_interval, interval / 2)
+            else:
+                interval = min(max_interval, interval * 1.5)
 
         await asyncio.sleep(interval)
@@ -20,35 +20,25 @@ async def lifespan(application: FastAPI):
     """Startup / shutdown lifecycle."""
     logger.info("Hikvision webhook mode active — turnstiles push events to /api/v1/hikvision/webhook")
     
-    # Start background tasks
-    checker_task = asyncio.create_task(device_status_worker())
-    hikvision_task = asyncio.create_task(hikvision_polling_loop())
-    esmo_task = None
-    esmo_health_task = None
-    if settings.ESMO_ENABLED:
-        esmo_task = asyncio.create_task(esmo_polling_loop())
-        esmo_health_task = asyncio.create_task(esmo_healthcheck_loop())
-    else:
-        logger.warning("ESMO polling is disabled (ESMO_ENABLED=false)")
-    
-    yield
-    
-    # Clean up
-    checker_task.cancel()
-    hikvision_task.cancel()
-    if esmo_task:
-        esmo_task.cancel()
-    if esmo_health_task:
-        esmo_health_task.cancel()
-    try:
-        tasks = [checker_task, hikvision_task]
-        if esmo_task:
-            tasks.append(esmo_task)
-        if esmo_health_task:
-            tasks.append(esmo_health_task)
-        await asyncio.gather(*tasks, return_exceptions=True)
-    except asyncio.CancelledError:
-        pass
+    # Background tasks live in one TaskGroup: leaving it waits for every task, so
+    # none outlives the app while still holding a DB session.
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(device_status_worker()),
+            tg.create_task(hikvision_polling_loop()),
+        ]
+        if settings.ESMO_ENABLED:
+            tasks.append(tg.create_task(esmo_polling_loop()))
+            tasks.append(tg.create_task(esmo_healthcheck_loop()))
+        else:
+            logger.warning("ESMO polling is disabled (ESMO_ENABLED=false)")
+
+        try:
+            yield
+        finally:
+            # The loops run forever; cancel them so the group can close.
+            for task in tasks:
+                task.cancel()
 
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
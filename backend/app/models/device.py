@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import Boolean, Column, DateTime, Enum as SAEnum, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Enum as SAEnum, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -31,4 +31,9 @@ class Device(Base):
     last_seen = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
+    __table_args__ = (
+        # Pollers resolve devices by (device_type, host) on every cycle.
+        Index("ix_devices_device_type_host", "device_type", "host"),
+    )
+
     events = relationship("Event", back_populates="device")
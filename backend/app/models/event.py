@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Enum as SAEnum, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -42,6 +42,7 @@ class Event(Base):
 
     __table_args__ = (
         UniqueConstraint("device_id", "raw_id", name="uq_events_device_raw_id"),
+        Index("ix_events_dedup", "device_id", "employee_id", "event_type", "status", "event_ts"),
     )
 
     employee = relationship("Employee", back_populates="events")
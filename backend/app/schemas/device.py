@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.device import DeviceType
 
@@ -34,8 +34,7 @@ class DeviceOut(BaseModel):
     is_active: bool
     last_seen: datetime | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DeviceDataStatusOut(BaseModel):
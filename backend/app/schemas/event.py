@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
+
+import orjson
 from pydantic import BaseModel, Field, model_validator
 
-from app.models.event import EventStatus, EventType
+from app.models.device import Device
+from app.models.employee import Employee
+from app.models.event import Event, EventStatus, EventType
 
 TURNSTILE_NAME_BY_HOST = {
     "192.168.1.181": "shaxta kirish",
     "192.168.1.180": "shaxta chiqish",
 }
+# Keys normalized once so clean host strings index it directly.
+_TURNSTILE_NAMES = {host.strip(): name for host, name in TURNSTILE_NAME_BY_HOST.items()}
 
 
 class EventIn(BaseModel):
@@ -50,76 +56,151 @@ class EventOut(BaseModel):
     patronymic: str | None = None
     device_name: str | None = None
     device_host: str | None = None
-
-    @property
-    def full_name(self) -> str | None:
-        parts = []
-        if self.last_name: parts.append(self.last_name)
-        if self.first_name: parts.append(self.first_name)
-        if self.patronymic: parts.append(self.patronymic)
-        
-        return " ".join(parts) if parts else None
+    full_name: str | None = None
 
     @model_validator(mode='before')
     @classmethod
     def flatten_data(cls, data: Any) -> Any:
         try:
-            # If data is an ORM object
-            if hasattr(data, "id"):
-                obj_dict = {
-                    "id": data.id,
-                    "device_id": data.device_id,
-
-                    "employee_id": data.employee_id,
-                    "event_type": data.event_type,
-                    "event_ts": data.event_ts,
-                    "received_ts": data.received_ts,
-                    "raw_id": data.raw_id,
-                    "status": data.status,
-                    "reject_reason": data.reject_reason,
-                }
-
-                source_payload = getattr(data, "source_payload", None) or {}
-                payload_employee_no = str(source_payload.get("employeeNoString") or source_payload.get("cardNo") or "").strip()
-                payload_name = str(source_payload.get("name") or "").strip()
-                event_type_value = (
-                    data.event_type.value if hasattr(data.event_type, "value") else str(data.event_type)
-                )
-                is_turnstile_event = event_type_value in {
-                    "TURNSTILE_IN",
-                    "TURNSTILE_OUT",
-                    "MINE_IN",
-                    "MINE_OUT",
-                }
-                
-                # Flatten Employee
-                if hasattr(data, "employee") and data.employee:
-                    obj_dict["employee_no"] = data.employee.employee_no
-                    obj_dict["first_name"] = data.employee.first_name
-                    obj_dict["last_name"] = data.employee.last_name
-                    obj_dict["patronymic"] = data.employee.patronymic
-
-                # For turnstile-like events, show raw device identity to avoid cross-domain ID confusion.
-                if is_turnstile_event and payload_employee_no:
-                    obj_dict["employee_no"] = payload_employee_no
-                if is_turnstile_event and payload_name:
-                    obj_dict["last_name"] = payload_name
-                    obj_dict["first_name"] = None
-                    obj_dict["patronymic"] = None
-                
-                # Flatten Device
-                if hasattr(data, "device") and data.device:
-                    device_host = data.device.host
-                    forced_name = TURNSTILE_NAME_BY_HOST.get(str(device_host or "").strip())
-                    obj_dict["device_name"] = forced_name or data.device.name
-                    obj_dict["device_host"] = device_host
-                    
-                return obj_dict
-            return data
+            # ORM objects flatten; anything without event attributes (dicts) passes through.
+            return _flatten_event(data)
         except Exception:
             return data
 
 
+def _flatten_event(data: Any) -> dict[str, Any]:
+    """Flatten an Event ORM object; its employee/device relationships should be preloaded."""
+    event_id = data.id  # raises AttributeError for non-ORM input
+    source_payload = getattr(data, "source_payload", None) or {}
+    employee = getattr(data, "employee", None)
+    device = getattr(data, "device", None)
+    return _event_row_item((
+        event_id,
+        data.device_id,
+        data.employee_id,
+        data.event_type,
+        data.event_ts,
+        data.received_ts,
+        data.raw_id,
+        data.status,
+        data.reject_reason,
+        source_payload.get("employeeNoString"),
+        source_payload.get("cardNo"),
+        source_payload.get("name"),
+        employee.employee_no if employee else None,
+        employee.first_name if employee else None,
+        employee.last_name if employee else None,
+        employee.patronymic if employee else None,
+        device.name if device else None,
+        device.host if device else None,
+    ))
+
+
+# Columns of one event row, in the order _event_row_item unpacks them. Employee and
+# Device are outer-joined by the caller, so no relationship is loaded per row.
+EVENT_ROW_COLUMNS = (
+    Event.id,
+    Event.device_id,
+    Event.employee_id,
+    Event.event_type,
+    Event.event_ts,
+    Event.received_ts,
+    Event.raw_id,
+    Event.status,
+    Event.reject_reason,
+    Event.source_payload["employeeNoString"].astext,
+    Event.source_payload["cardNo"].astext,
+    Event.source_payload["name"].astext,
+    Employee.employee_no,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.patronymic,
+    Device.name,
+    Device.host,
+)
+_TURNSTILE_LIKE_TYPES = frozenset({"TURNSTILE_IN", "TURNSTILE_OUT", "MINE_IN", "MINE_OUT"})
+
+
+def _event_row_item(row: tuple) -> dict[str, Any]:
+    (
+        event_id,
+        device_id,
+        employee_id,
+        event_type,
+        event_ts,
+        received_ts,
+        raw_id,
+        status,
+        reject_reason,
+        payload_employee_no,
+        payload_card_no,
+        payload_name,
+        employee_no,
+        first_name,
+        last_name,
+        patronymic,
+        device_name,
+        device_host,
+    ) = row
+
+    payload_employee_no = str(payload_employee_no or payload_card_no or "").strip()
+    payload_name = str(payload_name or "").strip()
+    try:
+        event_type_value = event_type.value
+    except AttributeError:
+        event_type_value = str(event_type)
+
+    # For turnstile-like events, show raw device identity to avoid cross-domain ID confusion.
+    if event_type_value in _TURNSTILE_LIKE_TYPES:
+        if payload_employee_no:
+            employee_no = payload_employee_no
+        if payload_name:
+            last_name, first_name, patronymic = payload_name, None, None
+
+    parts = tuple(part for part in (last_name, first_name, patronymic) if part)
+
+    # Device name is NOT NULL, so None means the event has no device row.
+    if device_name is not None:
+        # str.strip() returns the same object for already-clean hosts; str() only for odd types.
+        forced_name = _TURNSTILE_NAMES.get(
+            device_host.strip() if isinstance(device_host, str) else str(device_host or "").strip()
+        )
+        device_name = forced_name or device_name
+
+    return {
+        "id": event_id,
+        "device_id": device_id,
+        "employee_id": employee_id,
+        "event_type": event_type,
+        "event_ts": event_ts,
+        "received_ts": received_ts,
+        "raw_id": raw_id,
+        "status": status,
+        "reject_reason": reject_reason,
+        "employee_no": employee_no,
+        "first_name": first_name,
+        "last_name": last_name,
+        "patronymic": patronymic,
+        "device_name": device_name,
+        "device_host": device_host,
+        "full_name": " ".join(parts) if parts else None,
+    }
+
+
 class EventPageOut(BaseModel):
     items: list[EventOut]
     total: int
+
+
+# OPT_UTC_Z renders UTC datetimes with "Z", matching Pydantic's JSON output.
+_JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def encode_events(rows: Iterable[tuple]) -> bytes:
+    """JSON for a ``list[EventOut]`` response, encoded from ``EVENT_ROW_COLUMNS`` rows."""
+    return orjson.dumps([_event_row_item(row) for row in rows], option=_JSON_OPTIONS)
+
+
+def encode_events_page(rows: Iterable[tuple], total: int) -> bytes:
+    """JSON for an ``EventPageOut`` response, encoded from ``EVENT_ROW_COLUMNS`` rows."""
+    return orjson.dumps({"items": [_event_row_item(row) for row in rows], "total": total}, option=_JSON_OPTIONS)
@@ -1,6 +1,7 @@
+from __future__ import annotations
+
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class MedicalExamEmployee(BaseModel):
@@ -8,27 +9,25 @@ class MedicalExamEmployee(BaseModel):
     employee_no: str
     first_name: str
     last_name: str
-    patronymic: Optional[str] = None
+    patronymic: str | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MedicalExamBase(BaseModel):
     result: str
-    terminal_name: Optional[str] = None
-    pressure_systolic: Optional[int] = None
-    pressure_diastolic: Optional[int] = None
-    pulse: Optional[int] = None
-    temperature: Optional[float] = None
-    alcohol_mg_l: Optional[float] = None
+    terminal_name: str | None = None
+    pressure_systolic: int | None = None
+    pressure_diastolic: int | None = None
+    pulse: int | None = None
+    temperature: float | None = None
+    alcohol_mg_l: float | None = None
     timestamp: datetime
 
 class MedicalExamRead(MedicalExamBase):
     id: int
     employee_id: int
-    employee_full_name: Optional[str] = None
-    employee: Optional[MedicalExamEmployee] = None
+    employee_full_name: str | None = None
+    employee: MedicalExamEmployee | None = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -4,16 +4,22 @@ import sys
 # Add the current directory to sys.path
 sys.path.append(os.getcwd())
 
+from sqlalchemy import select
+
 from app.db.session import SessionLocal
 from app.models.event import Event
 
 def check_events():
     db = SessionLocal()
     try:
-        events = db.query(Event).order_by(Event.received_ts.desc()).limit(5).all()
-        print(f"Total events found: {len(events)}")
-        for e in events:
-            print(f"ID: {e.id}, Device: {e.device_id}, Status: {e.status}, Time: {e.received_ts}")
+        rows = db.execute(
+            select(Event.id, Event.device_id, Event.status, Event.received_ts)
+            .order_by(Event.received_ts.desc())
+            .limit(5)
+        ).all()
+        print(f"Total events found: {len(rows)}")
+        for event_id, device_id, status, received_ts in rows:
+            print(f"ID: {event_id}, Device: {device_id}, Status: {status}, Time: {received_ts}")
     finally:
         db.close()
 
@@ -1,6 +1,7 @@
 from app.db.session import SessionLocal
 from app.models.event import Event
-from sqlalchemy import func
+from sqlalchemy import Integer, any_, bindparam, delete
+from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import timedelta
 import logging
 
@@ -12,50 +13,49 @@ def clean_duplicates():
     try:
         logger.info("Starting duplicate cleanup...")
         
-        # Fetch all events ordered by employee and time
-        events = db.query(Event).order_by(Event.employee_id, Event.event_ts).all()
+        # Fetch only the compared columns, ordered by employee and time, streamed in batches
+        rows = (
+            db.query(Event.id, Event.employee_id, Event.event_type, Event.event_ts)
+            .order_by(Event.employee_id, Event.event_ts)
+            .yield_per(5000)
+        )
         
         to_delete = []
         count = 0
-        
-        if not events:
-            logger.info("No events found.")
-            return
+        window = timedelta(seconds=5)
 
         # Simple linear scan
         # We compare current event with the "last kept" event for the same employee
-        last_kept = events[0]
+        last_employee_id = last_event_type = last_event_ts = None
         
-        for current in events[1:]:
-            # Check if same employee
-            if current.employee_id == last_kept.employee_id:
-                # Check if same type
-                if current.event_type == last_kept.event_type:
-                    # Check time difference (within 5 seconds)
-                    diff = current.event_ts - last_kept.event_ts
-                    if diff < timedelta(seconds=5):
-                        # It's a duplicate
-                        to_delete.append(current.id)
-                        count += 1
-                        continue # Skip updating last_kept
+        for event_id, employee_id, event_type, event_ts in rows:
+            # Same employee, same type and within 5 seconds of the last kept event: duplicate
+            if (
+                last_event_ts is not None
+                and employee_id == last_employee_id
+                and event_type == last_event_type
+                and event_ts - last_event_ts < window
+            ):
+                to_delete.append(event_id)
+                count += 1
+                continue # Skip updating last_kept
             
             # If not duplicate (or different employee/type), this becomes the new last_kept
-            last_kept = current
+            last_employee_id, last_event_type, last_event_ts = employee_id, event_type, event_ts
+
+        if last_event_ts is None:
+            logger.info("No events found.")
+            return
 
         logger.info(f"Found {count} duplicate events to delete.")
         
         if to_delete:
-            # Delete in chunks if necessary, but for now simple delete
-            # db.query(Event).filter(Event.id.in_(to_delete)).delete(synchronize_session=False)
-            # SQLite/Postgres limit handling might be needed for huge lists, but let's try direct first
-            # Given potentially large number, let's loop
-            
-            chunk_size = 1000
-            for i in range(0, len(to_delete), chunk_size):
-                chunk = to_delete[i:i+chunk_size]
-                db.query(Event).filter(Event.id.in_(chunk)).delete(synchronize_session=False)
-                db.commit()
-                logger.info(f"Deleted chunk {i}-{i+len(chunk)}")
+            # One DELETE with the ids bound as a single array parameter, committed once
+            ids = bindparam("ids", to_delete, type_=ARRAY(Integer))
+            db.execute(
+                delete(Event).where(Event.id == any_(ids)).execution_options(synchronize_session=False)
+            )
+            db.commit()
             
             logger.info("Cleanup complete.")
         else:
@@ -1,5 +1,10 @@
 from sqlalchemy import text
 from app.db.session import engine
+import re
+
+# Last four "_"-separated digit groups (or an all-digit code of 2-4 groups), e.g. HIK_192_168_0_221.
+_IP_UNDERSCORE_RE = re.compile(r"^(\d+(?:_\d+){1,3})$|_(\d+(?:_\d+){3})$")
+_IP_RE = re.compile(r"(\d{1,3}(?:\.\d{1,3}){3})")
 
 def migrate():
     with engine.connect() as conn:
@@ -26,28 +31,33 @@ def migrate():
         res = conn.execute(text("SELECT id, device_code FROM minetrack.devices WHERE host IS NULL"))
         rows = res.fetchall()
         
+        updates = []
         for row in rows:
             device_id, code = row
             # If code is like HIK_192_168_0_221 -> 192.168.0.221
             host = None
-            if "_" in code:
-                parts = code.split("_")
-                ip_parts = [p for p in parts if p.replace(".", "").isdigit() or (p.isdigit() and int(p) <= 255)]
-                if len(ip_parts) >= 1:
-                    # In this specific case, 192_168_0_221 is split by _
-                    # Let's try to rejoin the last 4 parts if they are digits
-                    last_parts = parts[-4:]
-                    if all(p.isdigit() for p in last_parts):
-                        host = ".".join(last_parts)
+            match = _IP_UNDERSCORE_RE.search(code)
+            if match:
+                host = (match.group(1) or match.group(2)).replace("_", ".")
             
             if not host and "." in code: # Maybe it's already an IP or has one
-                 import re
-                 match = re.search(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})', code)
+                 match = _IP_RE.search(code)
                  if match:
                      host = match.group(1)
             
             if host:
-                conn.execute(text("UPDATE minetrack.devices SET host = :host WHERE id = :id"), {"host": host, "id": device_id})
+                updates.append((device_id, host))
+        
+        if updates:
+            # One UPDATE for every device: ids and hosts are bound as two parallel arrays
+            conn.execute(
+                text(
+                    "UPDATE minetrack.devices AS d SET host = v.host "
+                    "FROM unnest(:ids, :hosts) AS v(id, host) WHERE d.id = v.id"
+                ),
+                {"ids": [device_id for device_id, _ in updates], "hosts": [host for _, host in updates]},
+            )
+            for device_id, host in updates:
                 print(f"Updated device {device_id} with host {host}")
         
         conn.commit()
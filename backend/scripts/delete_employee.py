@@ -15,11 +15,14 @@ def delete_employee(emp_no):
         if emp:
             print(f"Found employee: {emp.last_name} {emp.first_name} {emp.patronymic} (ID: {emp.id}, No: {emp.employee_no})")
             
-            # Delete events
-            event_count = db.query(Event).filter(Event.employee_id == emp.id).count()
+            # Delete events (single bulk DELETE; rowcount replaces the separate count())
+            event_count = (
+                db.query(Event)
+                .filter(Event.employee_id == emp.id)
+                .delete(synchronize_session=False)
+            )
             if event_count > 0:
-                print(f"Deleting {event_count} associated events...")
-                db.query(Event).filter(Event.employee_id == emp.id).delete()
+                print(f"Deleted {event_count} associated events.")
             
             db.delete(emp)
             db.commit()
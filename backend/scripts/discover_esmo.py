@@ -9,14 +9,19 @@ Bu skript ESMO terminallarini xavfsiz tekshiradi:
 Ishlatish: python scripts/discover_esmo.py
 """
 
+import errno
+import selectors
 import socket
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # requests kutubxonasi kerak
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from requests.auth import HTTPBasicAuth, HTTPDigestAuth
 except ImportError:
     print("❌ 'requests' kutubxonasi kerak. O'rnating: pip install requests")
@@ -33,9 +38,33 @@ ESMO_DEVICES = [
     {"name": "TKM 4-terminal", "ip": "192.168.8.20", "serial": "SN020245004", "model": "MT-02"},
 ]
 
+# Bir vaqtda tekshiriladigan HTTP so'rovlar soni (timeoutlar parallel kutiladi)
+SCAN_WORKERS = 32
+
+# Umumiy HTTP sessiya — keep-alive ulanishlar parallel so'rovlar orasida qayta ishlatiladi
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=SCAN_WORKERS))
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=SCAN_WORKERS))
+
 # Tekshiriladigan portlar
 COMMON_PORTS = [80, 443, 8080, 8443, 3000, 5000, 8000, 8888, 9090, 22, 21, 23, 502, 1433, 3306, 5432]
 
+# Konsolga chiqariladigan HTTP statuslar
+INTERESTING_STATUSES = {200, 301, 302, 401}
+
+# Port bo'yicha sxemalar — 80-portga HTTPS, 443-portga HTTP so'rov yuborilmaydi
+SCHEMES_BY_PORT = {
+    80: ("http",),
+    3000: ("http",),
+    5000: ("http",),
+    8000: ("http",),
+    8080: ("http",),
+    443: ("https",),
+    8443: ("https",),
+    8888: ("http", "https"),
+    9090: ("http", "https"),
+}
+
 # Tekshiriladigan HTTP yo'llar (barcha GET — xavfsiz!)
 COMMON_API_PATHS = [
     "/",
@@ -74,32 +103,62 @@ COMMON_API_PATHS = [
 ]
 
 
-def check_port(ip: str, port: int, timeout: float = 1.5) -> bool:
-    """Portni tekshirish (TCP connect)"""
+# connect_ex() non-blocking soketda shu kodlardan birini qaytaradi (Windows: WSAEWOULDBLOCK)
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno, "WSAEWOULDBLOCK", -1)}
+
+
+def scan_ports(targets: list[tuple[str, int]], timeout: float = 1.5) -> set[tuple[str, int]]:
+    """Barcha (ip, port) juftliklarini bitta selector bilan tekshirish (non-blocking TCP connect).
+
+    Hamma ulanishlar bir vaqtda boshlanadi, shuning uchun umumiy vaqt ~bitta timeout.
+    """
+    open_targets: set[tuple[str, int]] = set()
+    selector = selectors.DefaultSelector()
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        result = sock.connect_ex((ip, port))
-        sock.close()
-        return result == 0
-    except Exception:
-        return False
+        for target in targets:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(target)
+            if err == 0:
+                open_targets.add(target)
+                sock.close()
+            elif err in _CONNECT_PENDING:
+                selector.register(sock, selectors.EVENT_WRITE, target)
+            else:
+                sock.close()
+
+        deadline = time.monotonic() + timeout
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                sock = key.fileobj
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    open_targets.add(key.data)
+                selector.unregister(sock)
+                sock.close()
+    finally:
+        # Timeout bo'lganlar — yopiq deb hisoblanadi
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+    return open_targets
 
 
 def check_http_endpoint(ip: str, port: int, path: str, timeout: float = 3) -> dict | None:
     """HTTP endpointni tekshirish (faqat GET — xavfsiz!)"""
-    for scheme in ["http", "https"]:
+    for scheme in SCHEMES_BY_PORT.get(port, ("http", "https")):
         url = f"{scheme}://{ip}:{port}{path}"
         try:
             # Birinchi oddiy so'rov
-            resp = requests.get(url, timeout=timeout, verify=False, allow_redirects=True)
+            resp = SESSION.get(url, timeout=timeout, verify=False, allow_redirects=True)
             result = {
                 "url": url,
                 "status_code": resp.status_code,
                 "content_type": resp.headers.get("Content-Type", ""),
                 "server": resp.headers.get("Server", ""),
                 "body_preview": resp.text[:500] if resp.text else "",
-                "headers": dict(resp.headers),
             }
 
             # Agar 401 bo'lsa — auth kerakligini ko'rsatadi
@@ -107,6 +166,7 @@ def check_http_endpoint(ip: str, port: int, path: str, timeout: float = 3) -> di
                 result["auth_required"] = True
                 result["www_authenticate"] = resp.headers.get("WWW-Authenticate", "")
 
+            # Javob keldi — ikkinchi sxemani sinash shart emas
             return result
         except requests.exceptions.SSLError:
             continue
@@ -119,7 +179,7 @@ def check_http_endpoint(ip: str, port: int, path: str, timeout: float = 3) -> di
     return None
 
 
-def scan_device(device: dict) -> dict:
+def scan_device(device: dict, open_targets: set[tuple[str, int]]) -> dict:
     """Bitta ESMO terminalni to'liq tekshirish"""
     ip = device["ip"]
     name = device["name"]
@@ -135,28 +195,15 @@ def scan_device(device: dict) -> dict:
     print(f"🔍 {name} ({ip}) tekshirilmoqda...")
     print(f"{'='*60}")
 
-    # 1. Ping tekshirish
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex((ip, 80))
-        sock.close()
-        # Try any port to check reachability
-        for p in [80, 443, 8080]:
-            if check_port(ip, p, 1):
-                results["ping_reachable"] = True
-                break
-    except Exception:
-        pass
-
-    # 2. Port scanning
-    print(f"  📡 Port scanning...")
+    # 1. Port scanning (natijalar main() dagi umumiy skandan)
     for port in COMMON_PORTS:
-        if check_port(ip, port):
+        if (ip, port) in open_targets:
             results["open_ports"].append(port)
             print(f"  ✅ Port {port} — OCHIQ")
-        else:
-            print(f"  ⬜ Port {port} — yopiq")
+    print(f"  📊 {len(results['open_ports'])}/{len(COMMON_PORTS)} port ochiq: {results['open_ports']}")
+
+    # 2. Ping — alohida probe shart emas, 80/443/8080 natijasi skandan olinadi
+    results["ping_reachable"] = any(p in results["open_ports"] for p in (80, 443, 8080))
 
     if not results["open_ports"]:
         print(f"  ❌ Hech qanday port ochiq emas! Terminal tarmoqqa ulanganligini tekshiring.")
@@ -169,23 +216,28 @@ def scan_device(device: dict) -> dict:
         return results
 
     print(f"\n  🌐 HTTP endpointlar tekshirilmoqda (portlar: {http_ports})...")
-    for port in http_ports:
-        for path in COMMON_API_PATHS:
-            result = check_http_endpoint(ip, port, path)
-            if result and result["status_code"] < 500:
-                results["http_endpoints"].append(result)
-                status = result["status_code"]
-                emoji = "✅" if status == 200 else "🔑" if status == 401 else "🔶"
-                print(f"  {emoji} {result['url']} — {status}")
-                if result.get("server"):
-                    print(f"      Server: {result['server']}")
-                if result.get("content_type"):
-                    print(f"      Type: {result['content_type']}")
-                if status == 401:
-                    print(f"      Auth: {result.get('www_authenticate', 'Kerak')}")
-                if result.get("body_preview") and status == 200:
-                    preview = result["body_preview"][:200].replace("\n", " ")
-                    print(f"      Body: {preview}")
+    targets = [(port, path) for port in http_ports for path in COMMON_API_PATHS]
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+        # map() tartibni saqlaydi — hisobot avvalgidek port/path ketma-ketligida chiqadi
+        probes = list(pool.map(lambda target: check_http_endpoint(ip, *target), targets))
+    for result in probes:
+        if result and result["status_code"] < 500:
+            results["http_endpoints"].append(result)
+            status = result["status_code"]
+            # Faqat qiziqarli javoblar chiqariladi (404 va h.k. faqat JSON faylga yoziladi)
+            if status not in INTERESTING_STATUSES:
+                continue
+            emoji = "✅" if status == 200 else "🔑" if status == 401 else "🔶"
+            print(f"  {emoji} {result['url']} — {status}")
+            if result.get("server"):
+                print(f"      Server: {result['server']}")
+            if result.get("content_type"):
+                print(f"      Type: {result['content_type']}")
+            if status == 401:
+                print(f"      Auth: {result.get('www_authenticate', 'Kerak')}")
+            if result.get("body_preview") and status == 200:
+                preview = result["body_preview"][:200].replace("\n", " ")
+                print(f"      Body: {preview}")
 
     return results
 
@@ -202,8 +254,13 @@ def main():
 
     all_results = []
 
+    # Barcha terminallarning portlari bitta selector bilan birga tekshiriladi
+    print(f"\n📡 Port scanning ({len(ESMO_DEVICES)} ta terminal)...")
+    targets = [(d["ip"], port) for d in ESMO_DEVICES for port in COMMON_PORTS]
+    open_targets = scan_ports(targets)
+
     for device in ESMO_DEVICES:
-        result = scan_device(device)
+        result = scan_device(device, open_targets)
         all_results.append(result)
 
     # Summary
@@ -236,16 +293,8 @@ def main():
     # Save results to file
     output_file = "scripts/esmo_discovery_results.json"
     with open(output_file, "w", encoding="utf-8") as f:
-        # Remove large body previews for JSON
-        clean_results = []
-        for r in all_results:
-            clean = {**r}
-            clean["http_endpoints"] = [
-                {k: v for k, v in ep.items() if k != "headers"}
-                for ep in r["http_endpoints"]
-            ]
-            clean_results.append(clean)
-        json.dump(clean_results, f, indent=2, ensure_ascii=False, default=str)
+        # Natijalar faqat oddiy JSON turlaridan iborat (timestamp allaqachon isoformat)
+        json.dump(all_results, f, indent=2, ensure_ascii=False)
 
     print(f"\n💾 Natijalar saqlandi: {output_file}")
     print("\n" + "=" * 60)
@@ -5,6 +5,17 @@ from datetime import datetime, timedelta, timezone
 
 import requests
 
+# (minutes ago, event type, raw_id suffix, payload)
+EVENT_SPECS: list[tuple[int, str, str, dict | None]] = [
+    (30, "TURNSTILE_IN", "t1", None),
+    (20, "MINE_IN", "m1", None),
+    (25, "ESMO_OK", "e1", {"bp": "120/80", "temp": 36.6}),
+    (15, "TOOL_TAKE", "t2", None),
+    (10, "MINE_IN", "m2", None),
+    (2, "MINE_OUT", "m3", None),
+    (1, "TOOL_RETURN", "t3", None),
+]
+
 
 def main() -> None:
     base_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
@@ -17,58 +28,18 @@ def main() -> None:
         return
 
     now = datetime.now(timezone.utc)
+    raw_id_prefix = f"{device_code}-"
 
     events = [
         {
             "device_code": device_code,
-            "raw_id": f"{device_code}-t1",
-            "event_type": "TURNSTILE_IN",
-            "event_ts": (now - timedelta(minutes=30)).isoformat(),
-            "employee_no": employee_no,
-        },
-        {
-            "device_code": device_code,
-            "raw_id": f"{device_code}-m1",
-            "event_type": "MINE_IN",
-            "event_ts": (now - timedelta(minutes=20)).isoformat(),
-            "employee_no": employee_no,
-        },
-        {
-            "device_code": device_code,
-            "raw_id": f"{device_code}-e1",
-            "event_type": "ESMO_OK",
-            "event_ts": (now - timedelta(minutes=25)).isoformat(),
-            "employee_no": employee_no,
-            "payload": {"bp": "120/80", "temp": 36.6},
-        },
-        {
-            "device_code": device_code,
-            "raw_id": f"{device_code}-t2",
-            "event_type": "TOOL_TAKE",
-            "event_ts": (now - timedelta(minutes=15)).isoformat(),
-            "employee_no": employee_no,
-        },
-        {
-            "device_code": device_code,
-            "raw_id": f"{device_code}-m2",
-            "event_type": "MINE_IN",
-            "event_ts": (now - timedelta(minutes=10)).isoformat(),
-            "employee_no": employee_no,
-        },
-        {
-            "device_code": device_code,
-            "raw_id": f"{device_code}-m3",
-            "event_type": "MINE_OUT",
-            "event_ts": (now - timedelta(minutes=2)).isoformat(),
-            "employee_no": employee_no,
-        },
-        {
-            "device_code": device_code,
-            "raw_id": f"{device_code}-t3",
-            "event_type": "TOOL_RETURN",
-            "event_ts": (now - timedelta(minutes=1)).isoformat(),
+            "raw_id": raw_id_prefix + tag,
+            "event_type": event_type,
+            "event_ts": (now - timedelta(minutes=minutes_ago)).isoformat(),
             "employee_no": employee_no,
-        },
+            **({"payload": payload} if payload else {}),
+        }
+        for minutes_ago, event_type, tag, payload in EVENT_SPECS
     ]
 
     url = f"{base_url}/api/v1/events/ingest"
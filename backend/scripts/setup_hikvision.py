@@ -1,14 +1,64 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
 from requests.auth import HTTPDigestAuth
-import xml.etree.ElementTree as ET
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.core.config import settings
 
+
+# Target server IP (this computer's IP)
+SERVER_IP = "192.168.0.3"
+SERVER_PORT = "8000"
+SERVER_URL = "/api/v1/hikvision/webhook"
+
+XML_PAYLOAD = f"""<?xml version="1.0" encoding="UTF-8"?>
+<HttpHostNotificationList version="2.0" xmlns="http://www.hikvision.com/ver20/XMLSchema">
+    <HttpHostNotification>
+        <id>1</id>
+        <url>{SERVER_URL}</url>
+        <protocolType>HTTP</protocolType>
+        <parameterFormatType>XML</parameterFormatType>
+        <addressingFormatType>ipaddress</addressingFormatType>
+        <ipAddress>{SERVER_IP}</ipAddress>
+        <portNo>{SERVER_PORT}</portNo>
+        <httpAuthenticationMethod>none</httpAuthenticationMethod>
+        <anprImageUploading>true</anprImageUploading>
+        <eventUploading>true</eventUploading>
+    </HttpHostNotification>
+</HttpHostNotificationList>
+"""
+
+
+def configure_one(session: requests.Session, device: dict) -> tuple[str, str, str]:
+    """Check connectivity and upload the HTTP listening config to one device."""
+    host = device.get("host")
+    name = device.get("name", host)
+    base_url = f"http://{host}/ISAPI/Event/notification/httpHosts"
+    auth = HTTPDigestAuth(settings.HIKVISION_USER, settings.HIKVISION_PASS)
+
+    try:
+        # 1. GET current config (Check connectivity)
+        resp = session.get(base_url, auth=auth, timeout=5)
+        resp.raise_for_status()
+    except Exception as e:
+        return name, "SKIPPING", f"Could not connect or auth failed. Error: {e}"
+
+    # 2. PUT the notification host config
+    try:
+        resp = session.put(base_url, data=XML_PAYLOAD, auth=auth, timeout=10)
+    except Exception as e:
+        return name, "ERROR", f"Error putting config: {e}"
+
+    if resp.status_code == 200:
+        return name, "SUCCESS", "Configuration updated."
+    return name, "FAILED", f"Status: {resp.status_code}. Body: {resp.text}"
+
+
 def setup_http_listening():
     # Parse devices from config
     import json
@@ -23,63 +73,15 @@ def setup_http_listening():
         return
 
     print(f"Found {len(devices)} devices to configure.")
+    print("\n--------------------------------------------------")
 
-    # Target server IP (this computer's IP)
-    server_ip = "192.168.0.3"
-    server_port = "8000"
-    server_url = "/api/v1/hikvision/webhook"
-
-    for device in devices:
-        host = device.get("host")
-        name = device.get("name", host)
-        user = settings.HIKVISION_USER
-        password = settings.HIKVISION_PASS
-
-        print(f"\n--------------------------------------------------")
-        print(f"Configuring device: {name} ({host})...")
-
-        base_url = f"http://{host}/ISAPI/Event/notification/httpHosts"
-        auth = HTTPDigestAuth(user, password)
-
-        try:
-            # 1. GET current config (Check connectivity)
-            print(f"  [{name}] Check connectivity...")
-            resp = requests.get(base_url, auth=auth, timeout=5)
-            resp.raise_for_status()
-            print(f"  [{name}] Connection OK.")
-        except Exception as e:
-            print(f"  [{name}] SKIPPING: Could not connect or auth failed. Error: {e}")
-            continue
-
-        # 2. Construct XML for PUT
-        xml_poyload = f"""<?xml version="1.0" encoding="UTF-8"?>
-<HttpHostNotificationList version="2.0" xmlns="http://www.hikvision.com/ver20/XMLSchema">
-    <HttpHostNotification>
-        <id>1</id>
-        <url>{server_url}</url>
-        <protocolType>HTTP</protocolType>
-        <parameterFormatType>XML</parameterFormatType>
-        <addressingFormatType>ipaddress</addressingFormatType>
-        <ipAddress>{server_ip}</ipAddress>
-        <portNo>{server_port}</portNo>
-        <httpAuthenticationMethod>none</httpAuthenticationMethod>
-        <anprImageUploading>true</anprImageUploading>
-        <eventUploading>true</eventUploading>
-    </HttpHostNotification>
-</HttpHostNotificationList>
-"""
+    # Devices are independent, so configure them concurrently over one shared session
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=min(16, len(devices))) as pool:
+        futures = [pool.submit(configure_one, session, device) for device in devices]
+        for future in as_completed(futures):
+            name, status, detail = future.result()
+            print(f"  [{name}] {status}: {detail}")
 
-        print(f"  [{name}] Uploading configuration...")
-        try:
-            resp = requests.put(base_url, data=xml_poyload, auth=auth, timeout=10)
-            
-            if resp.status_code == 200:
-                print(f"  [{name}] SUCCESS! Configuration updated.")
-            else:
-                print(f"  [{name}] FAILED. Status: {resp.status_code}. Body: {resp.text}")
-        except Exception as e:
-            print(f"  [{name}] Error putting config: {e}")
-            
     print("\n--------------------------------------------------")
     print("All devices processed.")
     print("Please reboot updated devices via iVMS for changes to take effect.")
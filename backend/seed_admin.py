@@ -13,7 +13,7 @@ print("Tables created (or already existed).")
 # Now seed admin user
 from app.db.session import SessionLocal
 from app.models.user import User
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, verify_password
 
 db = SessionLocal()
 try:
@@ -24,12 +24,15 @@ try:
     user = db.query(User).filter(User.username == username).first()
 
     if user:
-        print(f"User '{username}' found. Updating password...")
-        user.password_hash = get_password_hash(password)
         user.is_active = True
         if not user.role:
             user.role = "admin"
-        print("Password updated.")
+        if user.password_hash and verify_password(password, user.password_hash):
+            print(f"User '{username}' found. Password unchanged.")
+        else:
+            print(f"User '{username}' found. Updating password...")
+            user.password_hash = get_password_hash(password)
+            print("Password updated.")
     else:
         print(f"User '{username}' not found. Creating...")
         user = User(
@@ -1,5 +1,6 @@
 import logging
 import sys
+from sqlalchemy import func, select
 from app.db.session import SessionLocal
 from app.models.medical_exam import MedicalExam
 from app.models.employee import Employee
@@ -12,8 +13,13 @@ def test_db():
     db = SessionLocal()
     try:
         # Check counts
-        exam_count = db.query(MedicalExam).count()
-        emp_count = db.query(Employee).count()
+        # One round-trip: both counts as scalar subqueries of a single SELECT
+        exam_count, emp_count = db.execute(
+            select(
+                select(func.count()).select_from(MedicalExam).scalar_subquery(),
+                select(func.count()).select_from(Employee).scalar_subquery(),
+            )
+        ).one()
         print(f"DEBUG_INFO: EXAMS={exam_count}, EMPLOYEES={emp_count}")
         
         # Try a tiny write
@@ -1,29 +1,37 @@
 from __future__ import annotations
 
 import unittest
+from functools import lru_cache
 from pathlib import Path
 from unittest.mock import patch
 
 from bs4 import BeautifulSoup
 
-from app.core.esmo_client import EsmoClient
+from app.core.esmo_client import _EXAM_ROWS_ONLY, EsmoClient
 from app.core.esmo_poller import _resolve_esmo_terminal
 
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 
 
+@lru_cache(maxsize=None)
+def _fixture(filename: str) -> str:
+    return (BACKEND_ROOT / filename).read_text(encoding="utf-8", errors="ignore")
+
+
+@lru_cache(maxsize=None)
+def _soup(filename: str, rows_only: bool = False) -> BeautifulSoup:
+    # The parsers only read the tree, so one parse per fixture can be shared across tests.
+    # rows_only mirrors how the client parses monitor/journal pages (exam rows only).
+    return BeautifulSoup(_fixture(filename), "lxml", parse_only=_EXAM_ROWS_ONLY if rows_only else None)
+
+
 class EsmoParserRegressionTests(unittest.TestCase):
     def setUp(self) -> None:
         self.client = EsmoClient(base_url="https://example.invalid/cab/", username="u", password="p")
 
-    def _read_fixture(self, filename: str) -> str:
-        path = BACKEND_ROOT / filename
-        return path.read_text(encoding="utf-8", errors="ignore")
-
     def test_monitor_popup_parses_passed_and_failed_rows(self) -> None:
-        html = self._read_fixture("esmo_monitor_popup.html")
-        soup = BeautifulSoup(html, "lxml")
+        soup = _soup("esmo_monitor_popup.html", rows_only=True)
 
         # Network detail fetch must not be used for this regression fixture.
         with patch.object(self.client, "_fetch_exam_detail", return_value={}):
@@ -39,8 +47,7 @@ class EsmoParserRegressionTests(unittest.TestCase):
         self.assertGreater(result_counts.get("failed", 0), 0)
 
     def test_detail_table_vitals_are_parsed(self) -> None:
-        html = self._read_fixture("esmo_mo_sample.html")
-        soup = BeautifulSoup(html, "lxml")
+        soup = _soup("esmo_mo_sample.html")
         vitals = self.client._extract_vitals_from_detail_table(soup)
 
         self.assertEqual(vitals["pressure_systolic"], 105)
@@ -27,21 +27,25 @@ def init_db(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    # Partial index: get_unsent only touches pending rows, so the index stays O(pending)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_unsent ON buffered_events(id) WHERE sent = 0")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.commit()
 
 
 def buffer_events(conn: sqlite3.Connection, events: list[dict[str, Any]]) -> None:
-    for event in events:
-        raw_id = event.get("raw_id")
-        if not raw_id:
-            continue
-        try:
-            conn.execute(
-                "INSERT INTO buffered_events (raw_id, payload, sent, created_ts) VALUES (?, ?, 0, ?)",
-                (raw_id, json.dumps(event), datetime.now(timezone.utc).isoformat()),
-            )
-        except sqlite3.IntegrityError:
-            continue
+    created_ts = datetime.now(timezone.utc).isoformat()
+    rows = [
+        (event["raw_id"], json.dumps(event, separators=(",", ":")), created_ts)
+        for event in events
+        if event.get("raw_id")
+    ]
+    # OR IGNORE skips raw_ids that are already buffered (UNIQUE constraint)
+    conn.executemany(
+        "INSERT OR IGNORE INTO buffered_events (raw_id, payload, sent, created_ts) VALUES (?, ?, 0, ?)",
+        rows,
+    )
     conn.commit()
 
 
@@ -69,7 +73,9 @@ def mark_sent(conn: sqlite3.Connection, ids: list[int]) -> None:
     if not ids:
         return
     placeholders = ",".join("?" for _ in ids)
-    conn.execute(f"UPDATE buffered_events SET sent = 1 WHERE id IN ({placeholders})", ids)
+    # Keep the row (its raw_id stops the events file from being re-buffered on the
+    # next run) but drop the payload, which is never read again once sent.
+    conn.execute(f"UPDATE buffered_events SET sent = 1, payload = '' WHERE id IN ({placeholders})", ids)
     conn.commit()
 
 